@@ -3,31 +3,96 @@ import pandas as pd
 import time
 import random
 import os
+import sys
+import json
+import html
+import hashlib
+import asyncio
+import ssl
+import socket
+import queue
+import heapq
+import collections
+import itertools
+import sqlite3
+import threading
+import functools
+import atexit
+import contextlib
+import contextvars
 import tempfile
-from concurrent.futures import ThreadPoolExecutor
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+import uuid
+import shutil
+import urllib.error
+import urllib.parse
+import urllib.request
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 import zipfile
-import io
-from google.cloud import storage
-
-# def save_to_gcs(df, filename):
-#     client = storage.Client()
-#     bucket = client.get_bucket("your-bucket-name")
-#     blob = bucket.blob(f"clutch_data/{filename}")
-#     blob.upload_from_string(df.to_csv(index=False), content_type="text/csv")
-#     return f"gs://your-bucket-name/clutch_data/{filename}"
+# selenium and webdriver_manager are imported where a browser is started or driven, so the
+# HTTP backend, the CLI and a cold container start don't pay for them
 
 # Configuration
-DEFAULT_DELAY_RANGE = (1, 3)
-DEFAULT_MAX_WORKERS = 3
+DEFAULT_DELAY_RANGE = (0, 0.5)  # Random jitter added on top of each rate-limiter wait
+DEFAULT_RATE_PER_HOST = 1.5  # Lookups per second per search host, shared by all workers
+DEFAULT_ENGINE = os.environ.get("CLUTCH_ENGINE", "threads")  # "threads" or "async"
+ASYNC_CONCURRENCY = 50  # Lookups kept in flight by the async engine
+ADAPTIVE_THROTTLE = os.environ.get("CLUTCH_ADAPTIVE_THROTTLE", "1") == "1"  # AIMD rate/concurrency control
+ADAPTIVE_MIN_RATE = 0.2  # Lookups per second the controller never goes below
+ADAPTIVE_MAX_RATE = 8.0  # Lookups per second the controller never goes above
+ADAPTIVE_INTERVAL_STEP = 0.05  # Seconds shaved off the interval between lookups per success window
+ADAPTIVE_SUCCESS_WINDOW = 5  # Consecutive successes needed before speeding up
+ADAPTIVE_BACKOFF = 0.5  # Multiplier applied to rate and concurrency on a failure
+ADAPTIVE_COOLDOWN = 5.0  # Seconds after a backoff during which further failures don't back off again
+DEFAULT_MAX_WORKERS = int(os.environ.get("CLUTCH_MAX_WORKERS", "0")) or None  # None: sized by a WorkerGovernor
+STREAM_CHUNK_ROWS = 1000  # Rows read, looked up and written at a time when streaming a CSV
+KNOWN_RESULTS_MAX = 100_000  # Query results kept in memory for cross-file dedup while streaming
+DRIVER_POOL_SIZE = DEFAULT_MAX_WORKERS or 3  # Until a WorkerGovernor resizes the pool
+DRIVER_MAX_USES = 200  # Recycle a driver after this many lookups
+DRIVER_CHECKOUT_TIMEOUT = 300  # Seconds to wait for a free driver
+DRIVER_IDLE_CHECK = 60  # Seconds a driver can sit idle before its session is checked again at checkout
+WORKERS_PER_CPU = 2  # Lookups mostly wait on the network, so one CPU keeps a couple of browsers busy
+WORKER_CEILING = 32  # Most workers a governor ever allows, however large the machine
+DRIVER_MEMORY_ESTIMATE = 400 << 20  # Bytes assumed per Chrome until live drivers have been measured
+DRIVER_SHM_ESTIMATE = 64 << 20  # /dev/shm bytes per Chrome when it is allowed to use /dev/shm
+DRIVER_RSS_LIMIT = int(os.environ.get("CLUTCH_DRIVER_RSS_LIMIT_MB", "1024")) << 20  # Recycle a driver whose processes grow past this
+MEMORY_HEADROOM = 0.15  # Fraction of the memory limit never filled with drivers
+GOVERNOR_INTERVAL = 5.0  # Seconds between resource measurements
+CHROME_DEV_SHM = os.environ.get("CLUTCH_CHROME_DEV_SHM", "0") == "1"  # Let Chrome use /dev/shm instead of /tmp
+SEARCH_BACKEND = os.environ.get("CLUTCH_SEARCH_BACKEND", "selenium")  # "selenium" or "http"
+SEARCH_HOME_URL = "https://duckduckgo.com/"
+SEARCH_RESULTS_URL = os.environ.get("CLUTCH_SEARCH_RESULTS_URL", "https://html.duckduckgo.com/html/")
+SEARCH_NAVIGATION = os.environ.get("CLUTCH_SEARCH_NAVIGATION", "direct")  # "direct" results URL or "form" on the homepage
+HTTP_SEARCH_URL = os.environ.get("CLUTCH_HTTP_SEARCH_URL", "https://html.duckduckgo.com/html/")
+# Present once a results page has rendered, whether or not it has hits (HTML and JS result layouts)
+RESULTS_RENDERED_SELECTOR = ", ".join([
+    "a[href*='linkedin.com']",
+    ".result", ".no-results", ".results .result--no-result",
+    "[data-testid='result']", "[data-testid='no-results']", ".react-results--main li",
+])
+HTTP_TIMEOUT = 10
+LEAN_BROWSER = os.environ.get("CLUTCH_LEAN_BROWSER", "0") == "1"  # Block assets we never read and load pages eagerly
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.css", "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm",
+    "*improving.duckduckgo.com*", "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+]
+LEAN_BROWSER_ARGS = [
+    "--blink-settings=imagesEnabled=false",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-domain-reliability",
+    "--disable-sync",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,InterestFeedContentSuggestions",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+]
 
 # Set up default download directory
 # DOWNLOADS_DIR = Path.home() / "Downloads"
@@ -38,13 +103,319 @@ DOWNLOADS_DIR = Path("/tmp")
 CLUTCH_DATA_DIR = DOWNLOADS_DIR / "clutch_data"
 CLUTCH_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
+# Browser startup
+CHROMEDRIVER_PATH = os.environ.get("CLUTCH_CHROMEDRIVER")  # chromedriver baked into the image; nothing is resolved at runtime
+CHROMEDRIVER_CACHE = Path(os.environ.get("CLUTCH_CHROMEDRIVER_CACHE", str(CLUTCH_DATA_DIR / "chromedriver_path")))
+PREWARM_DRIVERS = int(os.environ.get("CLUTCH_PREWARM_DRIVERS", "1"))  # Browsers started in the background at startup
+
+# Lookup cache
+LOOKUP_CACHE_PATH = CLUTCH_DATA_DIR / "lookup_cache.sqlite3"
+LOOKUP_CACHE_TTL_FOUND = 30 * 24 * 3600  # Seconds to trust a found profile link
+LOOKUP_CACHE_TTL_NOT_FOUND = 3 * 24 * 3600  # Seconds to trust a "Not Found" result
+LOOKUP_CACHE_MAX_ENTRIES = 200_000
+LOOKUP_CACHE_MAX_CANDIDATES = 20_000  # Lookups whose profile candidates are kept for re-ranking, at most ~1 KB each
+CACHED_TITLE_CHARS = 120  # Title characters kept per cached candidate; snippets aren't cached
+
+# Checkpoints for resuming interrupted uploads
+CHECKPOINT_DIR = CLUTCH_DATA_DIR / "checkpoints"
+CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
+
+# Shared job queue for distributed workers
+DISTRIBUTED_MODE = os.environ.get("CLUTCH_DISTRIBUTED", "0") == "1"  # UI submits to the job queue instead of searching itself
+JOB_QUEUE_PATH = Path(os.environ.get("CLUTCH_JOB_QUEUE_PATH", str(CLUTCH_DATA_DIR / "job_queue.sqlite3")))
+JOB_LEASE_SECONDS = 300  # A leased query goes back to the queue if it isn't completed in time
+JOB_LEASE_BATCH = 5  # Queries a worker thread leases at a time
+JOB_POLL_SECONDS = 1.0  # How often idle workers and the submitter check the queue
+
+# Retries
+RETRY_MAX_ATTEMPTS = 3  # Lookups per query before it is reported as failed
+RETRY_BASE_DELAY = 2.0  # Seconds before the first retry; doubles with every further attempt
+RETRY_MAX_DELAY = 60.0
+
+# Hedged lookups
+HEDGE_LOOKUPS = os.environ.get("CLUTCH_HEDGE", "0") == "1"  # Duplicate lookups that run past the p95 latency
+HEDGE_BUDGET = 0.05  # Hedges allowed per lookup started, so total load grows by at most 5%
+HEDGE_MIN_SAMPLES = 20  # Lookups to observe before the p95 is trusted
+HEDGE_MIN_DELAY = 1.0  # Never hedge a lookup younger than this many seconds
+HEDGE_WINDOW = 200  # Recent successful lookups the p95 is computed from
+
+# Review harvesting (replaces clutch-extension.js)
+HARVEST_WORKERS = int(os.environ.get("CLUTCH_HARVEST_WORKERS", "8"))  # Review pages fetched at once; the host's rate limiter still applies
+REVIEW_PAGE_PARAM = "page"  # Query parameter selecting a profile's review page
+CLUTCH_SITE_URL = "https://clutch.co/"  # Relative profile links on saved directory pages resolve against this
+REVIEW_COLUMNS = ['Reviewer Company', 'Reviewer Name', 'Location', 'Company Size', 'Review Type']  # As written by the userscript
+
+# Background jobs
+JOB_EXECUTOR_WORKERS = 2  # Upload batches processed at once; they share the driver pool and rate limit
+JOB_HISTORY = 50  # Finished jobs kept in the registry for reloads and downloads
+PROGRESS_REFRESH_SECONDS = 1.0  # How often the page redraws running jobs
+
+# Artifacts
+ARTIFACT_DIR = Path(os.environ.get("CLUTCH_ARTIFACT_DIR", str(CLUTCH_DATA_DIR)))  # Jobs write outputs once, each in its own subdir
+STATIC_DIR = Path(__file__).resolve().parent / "static"  # Streamed at app/static/ when server.enableStaticServing is on
+STATIC_SERVING_MAX_BYTES = 200 << 20  # Streamlit's static file server refuses larger files
+OUTPUT_FORMATS = [f for f in os.environ.get("CLUTCH_OUTPUT_FORMATS", "").split(",") if f]  # Extra formats: parquet, arrow
+ARTIFACT_SINKS = [s for s in os.environ.get("CLUTCH_ARTIFACT_SINKS", "").split(",") if s]  # gs://bucket/prefix or a directory
+GCS_CHUNK_SIZE = 8 << 20  # Bytes per resumable upload request; a multiple of 256 KiB
+EXPORT_BLOCK_BYTES = 8 << 20  # CSV bytes converted per block when exporting to Parquet or Arrow
+
+# Metrics
+METRICS_PORT = os.environ.get("CLUTCH_METRICS_PORT")  # Serve Prometheus metrics at http://0.0.0.0:<port>/metrics
+METRICS_FILE = os.environ.get("CLUTCH_METRICS_FILE")  # Prometheus text file for node_exporter; "{pid}" is replaced
+METRICS_FILE_INTERVAL = 15  # Seconds between metrics file rewrites
+METRIC_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SPAN_LOG_PATH = os.environ.get("CLUTCH_SPAN_LOG")  # JSON-lines file with the timing spans of every row
+
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15"
 ]
 
-def setup_driver():
-    """Configure optimized Chrome WebDriver"""
+def _format_labels(labels, **extra):
+    items = list(labels) + list(extra.items())
+    if not items:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in items)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(items, escaped)) + "}"
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms, rendered in the Prometheus text format"""
+
+    def __init__(self, buckets=METRIC_BUCKETS, span_log_path=None):
+        self.buckets = buckets
+        self.span_log_path = span_log_path
+        self._counters = collections.defaultdict(float)  # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> [per-bucket counts..., sum, count]
+        self._help = {}
+        self._lock = threading.Lock()
+        self._span_log = None
+        self._span_lock = threading.Lock()
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def inc(self, name, value=1, **labels):
+        with self._lock:
+            self._counters[(name, tuple(sorted(labels.items())))] += value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram[i] += 1
+                    break
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def snapshot(self):
+        """Counter values and histogram (count, sum) pairs keyed by (name, labels)"""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "histograms": {key: (h[-1], h[-2]) for key, h in self._histograms.items()},
+            }
+
+    def log_span(self, entry):
+        if not self.span_log_path:
+            return
+        line = json.dumps(entry) + "\n"
+        # A lock of its own, so file writes never hold up inc() and observe()
+        with self._span_lock:
+            if self._span_log is None:
+                self._span_log = open(self.span_log_path, "a", encoding="utf-8", buffering=1)
+            self._span_log.write(line)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                typed.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        for (name, labels), histogram in histograms:
+            if name not in typed:
+                typed.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, count in zip(self.buckets, histogram):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels, le=f'{bound:g}')} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(labels, le='+Inf')} {histogram[-1]}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {histogram[-2]:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Atomically replace path with the current metrics"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+def start_metrics_server(metrics, port):
+    """Serve metrics.render() at /metrics from a daemon thread"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def start_metrics_file_writer(metrics, path, interval=METRICS_FILE_INTERVAL):
+    """Rewrite the metrics file every interval seconds and once more at exit"""
+
+    def loop():
+        while True:
+            time.sleep(interval)
+            metrics.write(path)
+
+    threading.Thread(target=loop, daemon=True).start()
+    atexit.register(metrics.write, path)
+
+@st.cache_resource
+def _metrics_registry():
+    metrics = MetricsRegistry(span_log_path=SPAN_LOG_PATH)
+    metrics.describe("clutch_rows_total", "Rows looked up, by outcome and failure reason")
+    metrics.describe("clutch_row_seconds", "Wall time per looked-up row, by outcome")
+    metrics.describe("clutch_phase_seconds", "Time per row spent in each lookup phase")
+    metrics.describe("clutch_drivers_recycled_total", "Drivers recycled by the worker governor, by reason")
+    metrics.describe("clutch_hedged_lookups_total", "Duplicate lookups of slow queries: started, won or cancelled")
+    metrics.describe("clutch_harvested_pages_total", "Clutch review pages fetched, by outcome and failure reason")
+    if METRICS_PORT:
+        try:
+            start_metrics_server(metrics, int(METRICS_PORT))
+        except OSError:
+            pass  # Another process (e.g. a sibling CLI worker) already serves this port
+    if METRICS_FILE:
+        start_metrics_file_writer(metrics, METRICS_FILE.format(pid=os.getpid()))
+    return metrics
+
+_metrics = None
+
+def get_metrics():
+    """Process-wide metrics registry, exported over HTTP and to a file when configured
+
+    The cached resource is looked up once per process. Any st.cache_resource
+    getter called off the script thread logs "missing ScriptRunContext"
+    warnings and costs ~0.5 ms, which is why the workers and schedulers hold on
+    to the resources they use rather than looking them up per row.
+    """
+    global _metrics
+    if _metrics is None:
+        _metrics = _metrics_registry()
+    return _metrics
+
+_current_trace = contextvars.ContextVar("clutch_row_trace", default=None)
+
+class RowTrace:
+    """Timing spans and outcome of one row, recorded into the metrics registry when the row ends
+
+    Phases: cache_lookup, throttle_wait (rate limit and politeness jitter),
+    driver_checkout (includes driver_start when a browser is launched),
+    page_load, render_wait, extract and cache_store.
+    """
+
+    def __init__(self):
+        self.query = None
+        self.outcome = None
+        self.reason = None
+        self.error = None
+        self.phases = collections.defaultdict(float)
+        self.started = time.perf_counter()
+
+    def finish(self, metrics):
+        elapsed = time.perf_counter() - self.started
+        metrics.inc("clutch_rows_total", outcome=self.outcome, reason=self.reason)
+        metrics.observe("clutch_row_seconds", elapsed, outcome=self.outcome)
+        for phase, seconds in self.phases.items():
+            metrics.observe("clutch_phase_seconds", seconds, phase=phase)
+        metrics.log_span({
+            "time": time.time(), "query": self.query, "outcome": self.outcome, "reason": self.reason,
+            "error": self.error, "seconds": round(elapsed, 6),
+            "phases": {phase: round(seconds, 6) for phase, seconds in self.phases.items()},
+        })
+
+@contextlib.contextmanager
+def row_trace():
+    """Collect the phase spans of the row processed inside the with-block"""
+    trace = RowTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        if trace.outcome is None:
+            trace.outcome, trace.reason = "error", "interrupted"
+        trace.finish(get_metrics())
+
+@contextlib.contextmanager
+def trace_phase(phase):
+    """Add the time spent in the with-block to the current row's phase; free outside a row"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.phases[phase] += time.perf_counter() - started
+
+def summarize_metrics(before, after):
+    """Per-phase and per-outcome totals between two MetricsRegistry snapshots, for display"""
+    phases = []
+    for (name, labels), (count, total) in after["histograms"].items():
+        if name != "clutch_phase_seconds":
+            continue
+        base_count, base_total = before["histograms"].get((name, labels), (0, 0.0))
+        if count > base_count:
+            phases.append({"phase": dict(labels)["phase"], "rows": count - base_count,
+                           "total_seconds": total - base_total,
+                           "mean_seconds": (total - base_total) / (count - base_count)})
+    outcomes = []
+    for (name, labels), value in after["counters"].items():
+        if name == "clutch_rows_total" and value > before["counters"].get((name, labels), 0):
+            outcomes.append(dict(labels, rows=int(value - before["counters"].get((name, labels), 0))))
+    phases = pd.DataFrame(phases, columns=["phase", "rows", "total_seconds", "mean_seconds"])
+    outcomes = pd.DataFrame(outcomes, columns=["outcome", "reason", "rows"])
+    return phases.sort_values("total_seconds", ascending=False), outcomes.sort_values("rows", ascending=False)
+
+def setup_driver(lean=LEAN_BROWSER, measure=False):
+    """Configure optimized Chrome WebDriver
+
+    lean blocks images, CSS, fonts and trackers via CDP and uses the eager page
+    load strategy; measure enables Chrome's performance log for measure_lookup.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
     options = Options()
     options.add_argument(f"user-agent={random.choice(USER_AGENTS)}")
     options.add_argument("--disable-blink-features=AutomationControlled")
@@ -53,91 +424,2952 @@ def setup_driver():
     options.add_argument("--disable-extensions")
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
+    if not CHROME_DEV_SHM:
+        options.add_argument("--disable-dev-shm-usage")
+    if lean:
+        options.page_load_strategy = "eager"
+        for argument in LEAN_BROWSER_ARGS:
+            options.add_argument(argument)
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+    if measure:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
     
-    service = Service(ChromeDriverManager().install())
+    service = Service(chromedriver_path())
     driver = webdriver.Chrome(service=service, options=options)
     driver.set_page_load_timeout(20)
+    if lean:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
     return driver
 
-def process_row(row, driver):
-    """Process a single row with an existing driver"""
-    name = str(row['Reviewer Name']).strip()
-    if name.lower() == "anonymous":
-        return "Anonymous"
-    
-    company = str(row['Reviewer Company']).split(",")[-1].strip() if "," in str(row['Reviewer Company']) else str(row['Reviewer Company']).strip()
-    
+def measure_lookup(driver, query):
+    """Bytes transferred, request counts and wall time of one search on a measure=True driver"""
+    driver.get_log("performance")  # Drop entries from earlier navigations
+    started = time.perf_counter()
     try:
-        query = f"{name} {company} site:linkedin.com/in"
-        
-        driver.get("https://duckduckgo.com/")
-        search_box = WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.NAME, "q")))
+        SeleniumResolver(driver=driver).search(query)
+        outcome = "ok"
+    except Exception as e:
+        outcome = classify_failure(e)
+    elapsed = time.perf_counter() - started
+
+    transferred = requests = blocked = 0
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        if message["method"] == "Network.requestWillBeSent":
+            requests += 1
+        elif message["method"] == "Network.loadingFinished":
+            transferred += message["params"].get("encodedDataLength", 0)
+        elif message["method"] == "Network.loadingFailed" and message["params"].get("blockedReason"):
+            blocked += 1
+    return {"seconds": elapsed, "bytes": transferred, "requests": requests, "blocked": blocked, "outcome": outcome}
+
+@functools.lru_cache(maxsize=1)
+def chromedriver_path():
+    """Resolve the chromedriver binary once per process, without the network whenever possible
+
+    Tries CLUTCH_CHROMEDRIVER, then the path remembered in CHROMEDRIVER_CACHE,
+    then chromedriver on PATH. Only if all of those fail is webdriver_manager
+    asked to download one, and the path it returns is remembered for next time.
+    """
+    candidates = [CHROMEDRIVER_PATH]
+    try:
+        candidates.append(CHROMEDRIVER_CACHE.read_text().strip())
+    except OSError:
+        pass
+    candidates.append(shutil.which("chromedriver"))
+    for path in candidates:
+        if path and os.access(path, os.X_OK):
+            return path
+
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    path = ChromeDriverManager().install()
+    try:
+        CHROMEDRIVER_CACHE.write_text(path)
+    except OSError:
+        pass
+    return path
+
+class DriverUnavailableError(RuntimeError):
+    """Raised when the pool cannot hand out a working driver"""
+
+class DriverPool:
+    """Long-lived pool of warm Chrome drivers shared across batches, files and reruns"""
+
+    def __init__(self, size=DRIVER_POOL_SIZE, max_uses=DRIVER_MAX_USES, factory=setup_driver, idle_check=DRIVER_IDLE_CHECK):
+        self.size = size
+        self.max_uses = max_uses
+        self.factory = factory
+        self.idle_check = idle_check
+        self._idle = []
+        self._idle_since = {}  # id -> when the driver was last checked in
+        self._uses = {}
+        self._drivers = {}  # id -> every live driver, idle or checked out
+        self._retiring = set()  # ids of checked-out drivers to recycle when they come back
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.metrics = {
+            "created": 0,
+            "checkouts": 0,
+            "returns": 0,
+            "recycled": 0,
+            "crashed": 0,
+            "oversized": 0,
+            "checkout_wait_seconds": 0.0,
+        }
+
+    def checkout(self, timeout=DRIVER_CHECKOUT_TIMEOUT):
+        """Borrow a healthy driver, starting one if the pool is below capacity"""
+        with trace_phase("driver_checkout"):
+            return self._checkout(timeout)
+
+    def _checkout(self, timeout):
+        started = time.monotonic()
+        while True:
+            with self._cond:
+                while not self._idle and self._live >= self.size:
+                    remaining = timeout - (time.monotonic() - started)
+                    if self._closed or remaining <= 0:
+                        raise DriverUnavailableError("No driver available in the pool")
+                    self._cond.wait(remaining)
+                if self._closed:
+                    raise DriverUnavailableError("Driver pool is closed")
+                driver = self._idle.pop() if self._idle else None
+                if driver is None:
+                    self._live += 1
+                else:
+                    idle_for = time.monotonic() - self._idle_since.pop(id(driver))
+
+            if driver is None:
+                try:
+                    with trace_phase("driver_start"):
+                        driver = self.factory()
+                except Exception as e:
+                    self._discard(None)
+                    raise DriverUnavailableError(f"Could not start Chrome: {e}") from e
+                with self._cond:
+                    self._uses[id(driver)] = 0
+                    self._drivers[id(driver)] = driver
+                    self.metrics["created"] += 1
+            # A session that died during a lookup is caught at checkin; only long-idle ones cost a round trip here
+            elif idle_for > self.idle_check and not self._is_healthy(driver):
+                with self._cond:
+                    self.metrics["crashed"] += 1
+                self._discard(driver)
+                continue
+
+            with self._cond:
+                self.metrics["checkouts"] += 1
+                self.metrics["checkout_wait_seconds"] += time.monotonic() - started
+            return driver
+
+    def checkin(self, driver, healthy=True):
+        """Return a driver, recycling it if it crashed, reached its use limit, was retired or the pool shrank"""
+        with self._cond:
+            self.metrics["returns"] += 1
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+            worn_out = self._uses[id(driver)] >= self.max_uses
+            surplus = id(driver) in self._retiring or self._live > self.size
+            if healthy and not worn_out and not surplus and not self._closed:
+                self._idle.append(driver)
+                self._idle_since[id(driver)] = time.monotonic()
+                self._cond.notify()
+                return
+            if not healthy:
+                self.metrics["crashed"] += 1
+            elif worn_out:
+                self.metrics["recycled"] += 1
+        self._discard(driver)
+
+    @contextlib.contextmanager
+    def lease(self):
+        """Check out a driver for the duration of a with-block"""
+        driver = self.checkout()
+        healthy = True
+        try:
+            yield driver
+        except Exception as e:
+            # A dead session is replaced right away so the next lookup gets a fresh browser
+            healthy = not is_dead_session(e) and self._is_healthy(driver)
+            raise
+        finally:
+            self.checkin(driver, healthy)
+
+    def warm(self, count):
+        """Start up to count drivers in parallel and leave them idle, so early lookups don't wait for Chrome"""
+        with self._cond:
+            count = min(count, self.size - self._live)
+        if count <= 0:
+            return 0
+
+        def start():
+            try:
+                return self.checkout(timeout=0)
+            except DriverUnavailableError:
+                return None
+
+        with ThreadPoolExecutor(max_workers=count, thread_name_prefix="clutch-warm") as executor:
+            drivers = [driver for driver in executor.map(lambda _: start(), range(count)) if driver is not None]
+        for driver in drivers:
+            self.checkin(driver)
+        return len(drivers)
+
+    def stats(self):
+        """Snapshot of pool counters for display"""
+        with self._cond:
+            return dict(self.metrics, live=self._live, idle=len(self._idle), in_use=self._live - len(self._idle),
+                        size=self.size)
+
+    def drivers(self):
+        """Every live driver, idle or checked out"""
+        with self._cond:
+            return list(self._drivers.values())
+
+    def resize(self, size):
+        """Change capacity; idle drivers above it quit now, checked-out ones when they come back"""
+        with self._cond:
+            self.size = size
+            surplus = []
+            while self._idle and self._live - len(surplus) > size:
+                driver = self._idle.pop(0)
+                self._idle_since.pop(id(driver), None)
+                surplus.append(driver)
+            self._cond.notify_all()
+        for driver in surplus:
+            self._discard(driver)
+
+    def retire(self, driver):
+        """Recycle a driver that grew too large: now if idle, otherwise at checkin"""
+        with self._cond:
+            if id(driver) in self._retiring or id(driver) not in self._drivers:
+                return
+            self.metrics["oversized"] += 1
+            if driver not in self._idle:
+                self._retiring.add(id(driver))
+                return
+            self._idle.remove(driver)
+            self._idle_since.pop(id(driver), None)
+        self._discard(driver)
+
+    def close(self):
+        """Quit every idle driver and refuse further checkouts"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._idle_since.clear()
+            self._cond.notify_all()
+        for driver in idle:
+            self._discard(driver)
+
+    def _is_healthy(self, driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver):
+        with self._cond:
+            self._live -= 1
+            if driver is not None:
+                self._uses.pop(id(driver), None)
+                self._drivers.pop(id(driver), None)
+                self._retiring.discard(id(driver))
+            self._cond.notify()
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+@st.cache_resource
+def get_driver_pool():
+    """Process-wide driver pool that survives Streamlit reruns"""
+    pool = DriverPool()
+    atexit.register(pool.close)
+    return pool
+
+def _read_int(path):
+    """Integer contents of a cgroup or proc file, None if missing or unlimited ("max")"""
+    try:
+        text = Path(path).read_text().split()
+    except OSError:
+        return None
+    return int(text[0]) if text and text[0].lstrip("-").isdigit() else None
+
+def _cgroup_v2_dir():
+    """This process's cgroup v2 directory, or None on a cgroup v1 (or cgroup-less) host"""
+    try:
+        for line in Path("/proc/self/cgroup").read_text().splitlines():
+            if line.startswith("0::"):
+                # Inside a container the namespaced path may not be mounted; its root is then our cgroup
+                for path in (Path("/sys/fs/cgroup") / line[3:].lstrip("/"), Path("/sys/fs/cgroup")):
+                    if (path / "cgroup.controllers").exists():
+                        return path
+    except OSError:
+        pass
+    return None
+
+def available_cpus():
+    """CPUs this process may use: its affinity mask, capped by any cgroup CPU quota"""
+    try:
+        cpus = float(len(os.sched_getaffinity(0)))
+    except AttributeError:
+        cpus = float(os.cpu_count() or 1)
+    quota = period = None
+    cgroup = _cgroup_v2_dir()
+    if cgroup is not None:
+        try:
+            fields = (cgroup / "cpu.max").read_text().split()
+            if fields[0] != "max":
+                quota, period = int(fields[0]), int(fields[1])
+        except (OSError, IndexError, ValueError):
+            pass
+    else:
+        quota = _read_int("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+        period = _read_int("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+    if quota and quota > 0 and period:
+        cpus = min(cpus, max(1.0, quota / period))
+    return cpus
+
+def memory_usage():
+    """(limit, used) bytes for this container: its cgroup memory limit if set, else the machine's
+
+    Reclaimable page cache (inactive_file) doesn't count as used, as in the
+    kernel's own OOM accounting.
+    """
+    meminfo = {}
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                name, value = line.split(":", 1)
+                meminfo[name] = int(value.split()[0]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    total = meminfo.get("MemTotal")
+    used = total - meminfo.get("MemAvailable", total) if total else None
+
+    cgroup = _cgroup_v2_dir()
+    if cgroup is not None:
+        files = (cgroup / "memory.max", cgroup / "memory.current", cgroup / "memory.stat", "inactive_file")
+    else:
+        cgroup = Path("/sys/fs/cgroup/memory")
+        files = (cgroup / "memory.limit_in_bytes", cgroup / "memory.usage_in_bytes", cgroup / "memory.stat",
+                 "total_inactive_file")
+    limit_path, usage_path, stat_path, inactive_name = files
+    limit = _read_int(limit_path)
+    # cgroup v1 reports "no limit" as a huge number
+    if limit is None or (total and limit >= total):
+        return total, used
+    usage = _read_int(usage_path)
+    if usage is None:
+        return limit, used
+    try:
+        for line in stat_path.read_text().splitlines():
+            name, value = line.split()
+            if name == inactive_name:
+                usage -= int(value)
+    except (OSError, ValueError):
+        pass
+    return limit, usage
+
+def shm_bytes():
+    """Size of /dev/shm, or None where it doesn't exist"""
+    try:
+        stats = os.statvfs("/dev/shm")
+    except (OSError, AttributeError):
+        return None
+    return stats.f_frsize * stats.f_blocks
+
+def process_table():
+    """Map of pid -> (parent pid, resident bytes) for every process in /proc"""
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    table = {}
+    try:
+        pids = [entry for entry in os.listdir("/proc") if entry.isdigit()]
+    except OSError:
+        return table
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as f:
+                # The command name may hold spaces and parentheses; the fields after its last ")" don't
+                fields = f.read().rsplit(b")", 1)[1].split()
+        except (OSError, IndexError):
+            continue  # Exited since listdir
+        table[int(pid)] = (int(fields[1]), int(fields[21]) * page_size)
+    return table
+
+def tree_rss(pid, table):
+    """Resident bytes of a process and all of its descendants"""
+    children = collections.defaultdict(list)
+    for child, (parent, _) in table.items():
+        children[parent].append(child)
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        if current in table:
+            total += table[current][1]
+        stack.extend(children.get(current, ()))
+    return total
+
+def driver_pid(driver):
+    """Pid of the chromedriver process behind a driver, or None for drivers without one"""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return getattr(process, "pid", None)
+
+class WorkerGovernor:
+    """Size lookup concurrency from CPU, memory and /dev/shm headroom and the real RSS of live drivers
+
+    A daemon thread re-measures every interval seconds: it retires drivers
+    whose chromedriver + Chrome process tree outgrew rss_limit, sets how many
+    workers may look up at once (threads beyond that wait in slot()) and
+    resizes the driver pool to match. Drivers are costed at the mean RSS of
+    the live ones, or DRIVER_MEMORY_ESTIMATE before any have started.
+
+    share is the fraction of the machine this process may use, for when
+    several processes run side by side; pin() fixes the worker count instead.
+    """
+
+    def __init__(self, pool=None, workers=DEFAULT_MAX_WORKERS, share=1.0, interval=GOVERNOR_INTERVAL,
+                 rss_limit=DRIVER_RSS_LIMIT):
+        self.pool = pool
+        self.fixed = workers
+        self.share = share
+        self.interval = interval
+        self.rss_limit = rss_limit
+        self.workers = workers or 1
+        self.resources = {}
+        self._active = 0
+        self._slots = threading.Condition()
+        self._thread = None
+        self.adjust()
+
+    @property
+    def ceiling(self):
+        """Threads a worker pool should start: the most workers this governor will ever allow"""
+        if self.fixed:
+            return self.fixed
+        return max(1, min(WORKER_CEILING, int(available_cpus() * WORKERS_PER_CPU * self.share)))
+
+    def pin(self, workers):
+        """Fix the worker count (None goes back to sizing from resources)"""
+        self.fixed = workers
+        self.adjust()
+
+    def target(self, cpus, memory_limit, memory_used, shm, driver_rss):
+        """Workers the measured resources allow"""
+        limits = [WORKER_CEILING, int(cpus * WORKERS_PER_CPU * self.share)]
+        if self.pool is not None:
+            per_driver = sum(driver_rss) / len(driver_rss) if driver_rss else DRIVER_MEMORY_ESTIMATE
+            if memory_limit and memory_used is not None:
+                # Live drivers are already part of memory_used
+                budget = memory_limit * (1 - MEMORY_HEADROOM) - memory_used
+                limits.append(len(driver_rss) + int(budget * self.share // per_driver))
+            if CHROME_DEV_SHM and shm:
+                limits.append(int(shm * self.share // DRIVER_SHM_ESTIMATE))
+        return max(1, min(limits))
+
+    def adjust(self):
+        """Measure, retire oversized drivers and set the number of workers allowed to run"""
+        driver_rss = []
+        if self.pool is not None:
+            table = process_table()
+            for driver in self.pool.drivers():
+                pid = driver_pid(driver)
+                if pid is None or pid not in table:
+                    continue
+                rss = tree_rss(pid, table)
+                if rss > self.rss_limit:
+                    self.pool.retire(driver)
+                    get_metrics().inc("clutch_drivers_recycled_total", reason="memory")
+                else:
+                    driver_rss.append(rss)
+
+        cpus, (memory_limit, memory_used), shm = available_cpus(), memory_usage(), shm_bytes()
+        workers = self.fixed or self.target(cpus, memory_limit, memory_used, shm, driver_rss)
+        with self._slots:
+            self.workers = workers
+            self._slots.notify_all()
+        if self.pool is not None:
+            self.pool.resize(workers)
+        self.resources = {
+            "cpus": cpus,
+            "memory_limit": memory_limit,
+            "memory_used": memory_used,
+            "shm": shm,
+            "drivers_measured": len(driver_rss),
+            "driver_rss_mean": sum(driver_rss) / len(driver_rss) if driver_rss else None,
+        }
+        return workers
+
+    def start(self):
+        """Re-measure every interval seconds from a daemon thread"""
+        if self._thread is not None:
+            return
+
+        def loop():
+            while True:
+                time.sleep(self.interval)
+                try:
+                    self.adjust()
+                except Exception:
+                    pass  # A failed measurement keeps the current size
+
+        self._thread = threading.Thread(target=loop, name="clutch-governor", daemon=True)
+        self._thread.start()
+
+    @contextlib.contextmanager
+    def slot(self):
+        """Concurrency gate around a worker's unit of work"""
+        with self._slots:
+            while self._active >= self.workers:
+                self._slots.wait()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._slots:
+                self._active -= 1
+                self._slots.notify()
+
+    def free(self):
+        """Slots not in use right now, by any pool sharing this governor"""
+        with self._slots:
+            return max(0, self.workers - self._active)
+
+    def describe(self):
+        text = f"{self.workers} of {self.ceiling} workers"
+        if self.resources.get("driver_rss_mean"):
+            text += f" · {self.resources['driver_rss_mean'] / 2**20:.0f} MB per browser"
+        return text
+
+@st.cache_resource
+def start_prewarm(backend=SEARCH_BACKEND, count=PREWARM_DRIVERS):
+    """Import the browser stack, resolve chromedriver and start count browsers on a daemon thread, once per process"""
+    if backend != "selenium" or count <= 0:
+        return None
+
+    def warm():
+        try:
+            get_driver_pool().warm(min(count, get_worker_governor(backend).workers))
+        except Exception:
+            pass  # The first lookup starts its own browser and reports the failure
+
+    thread = threading.Thread(target=warm, name="clutch-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+@st.cache_resource
+def get_worker_governor(backend=SEARCH_BACKEND):
+    """Process-wide governor for a search backend; only the Selenium one manages the driver pool"""
+    governor = WorkerGovernor(get_driver_pool() if backend == "selenium" else None)
+    governor.start()
+    return governor
+
+def worker_plan(max_workers, backend):
+    """Threads to start and the gate they share: max_workers as given, or as many as the governor allows"""
+    if max_workers:
+        return max_workers, contextlib.nullcontext
+    governor = get_worker_governor(backend)
+    return governor.ceiling, governor.slot
+
+@contextlib.asynccontextmanager
+async def _async_nullcontext():
+    yield
+
+class TokenBucket:
+    """Thread- and asyncio-safe rate limiter shared by every worker hitting a host"""
+
+    def __init__(self, rate=DEFAULT_RATE_PER_HOST, burst=1, jitter=DEFAULT_DELAY_RANGE):
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, jitter=None):
+        """Take a token and return how many seconds the caller must wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        return wait + random.uniform(*(jitter or self.jitter))
+
+    def acquire(self, jitter=None):
+        """Block the calling thread until a token is available"""
+        time.sleep(self.reserve(jitter))
+
+    async def acquire_async(self, jitter=None):
+        """Suspend the calling coroutine until a token is available"""
+        await asyncio.sleep(self.reserve(jitter))
+
+    def slot(self):
+        """Concurrency gate around a lookup; unlimited for a plain bucket"""
+        return contextlib.nullcontext()
+
+    def slot_async(self):
+        return _async_nullcontext()
+
+    def record(self, outcome):
+        """Observe a lookup outcome ("ok", "timeout", "no_search_box", "blocked" or "error")"""
+
+    def describe(self):
+        return f"{self.rate:.2f} lookups/s"
+
+# Failures that say nothing about how hard we are hitting the search host
+THROTTLE_NEUTRAL_OUTCOMES = ("driver_crashed", "driver_unavailable", "error")
+
+class AdaptiveThrottle(TokenBucket):
+    """Token bucket whose rate and concurrency follow AIMD on observed lookup outcomes
+
+    Every ADAPTIVE_SUCCESS_WINDOW successes shorten the interval between lookups
+    by ADAPTIVE_INTERVAL_STEP and allow one more concurrent lookup. Any failure
+    multiplies both by ADAPTIVE_BACKOFF, at most once per ADAPTIVE_COOLDOWN.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE_PER_HOST, concurrency=DEFAULT_MAX_WORKERS or 3, max_concurrency=WORKER_CEILING,
+                 min_rate=ADAPTIVE_MIN_RATE, max_rate=ADAPTIVE_MAX_RATE, jitter=DEFAULT_DELAY_RANGE):
+        super().__init__(rate, jitter=jitter)
+        self.concurrency = concurrency
+        self.max_concurrency = max_concurrency
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.outcomes = collections.Counter()
+        self._active = 0
+        self._successes = 0
+        self._last_backoff = 0.0
+        self._slots = threading.Condition(self._lock)
+        self._async_waiters = collections.deque()  # (loop, future) of coroutines waiting in slot_async
+
+    def _wake(self, everyone=False):
+        """Wake threads and coroutines waiting for a slot; the lock must be held"""
+        if everyone:
+            self._slots.notify_all()
+            waiters, self._async_waiters = list(self._async_waiters), collections.deque()
+        else:
+            self._slots.notify()
+            waiters = [self._async_waiters.popleft()] if self._async_waiters else []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_resolve_waiter, waiter)
+
+    @contextlib.contextmanager
+    def slot(self):
+        with self._slots:
+            while self._active >= self.concurrency:
+                self._slots.wait()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._slots:
+                self._active -= 1
+                self._wake()
+
+    @contextlib.asynccontextmanager
+    async def slot_async(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._slots:
+                if self._active < self.concurrency:
+                    self._active += 1
+                    break
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._slots:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+                    else:
+                        self._wake()  # Pass on the wake-up this coroutine can no longer use
+                raise
+        try:
+            yield
+        finally:
+            with self._slots:
+                self._active -= 1
+                self._wake()
+
+    def record(self, outcome):
+        with self._slots:
+            self.outcomes[outcome] += 1
+            if outcome in THROTTLE_NEUTRAL_OUTCOMES:
+                return
+            if outcome == "ok":
+                self._successes += 1
+                if self._successes >= ADAPTIVE_SUCCESS_WINDOW:
+                    self._successes = 0
+                    interval = max(1 / self.max_rate, 1 / self.rate - ADAPTIVE_INTERVAL_STEP)
+                    self.rate = 1 / interval
+                    self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+                    self._wake(everyone=True)
+                return
+
+            self._successes = 0
+            now = time.monotonic()
+            if now - self._last_backoff < ADAPTIVE_COOLDOWN:
+                return
+            self._last_backoff = now
+            self.rate = max(self.min_rate, self.rate * ADAPTIVE_BACKOFF)
+            self.concurrency = max(1, int(self.concurrency * ADAPTIVE_BACKOFF))
+
+    def describe(self):
+        return f"{self.rate:.2f} lookups/s · {self.concurrency} concurrent"
+
+def _resolve_waiter(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+@st.cache_resource
+def get_token_bucket(host):
+    """Per-host rate limiter that survives Streamlit reruns"""
+    return AdaptiveThrottle() if ADAPTIVE_THROTTLE else TokenBucket()
+
+class LookupFailure(RuntimeError):
+    """A lookup that ended without a result; reason names the failure class for metrics and reports"""
+
+    reason = "error"
+    retryable = False
+
+    def __init__(self, message="", reason=None, retryable=None):
+        super().__init__(message)
+        if reason is not None:
+            self.reason = reason
+        if retryable is not None:
+            self.retryable = retryable
+
+class SearchBlockedError(LookupFailure):
+    """The search engine served a block/CAPTCHA page or a rate-limit status"""
+    reason = "blocked"
+    retryable = True
+
+class SearchBoxMissingError(LookupFailure):
+    """The search page loaded without its query box"""
+    reason = "no_search_box"
+    retryable = True
+
+class SearchTimeoutError(LookupFailure):
+    """The results page did not render in time"""
+    reason = "timeout"
+    retryable = True
+
+class SearchNetworkError(LookupFailure):
+    """The search request failed in transit or the server answered with an error status"""
+    reason = "network"
+    retryable = True
+
+class DriverCrashedError(LookupFailure):
+    """The browser session died mid-lookup; the pool replaces the driver before the retry"""
+    reason = "driver_crashed"
+    retryable = True
+
+DEAD_SESSION_MARKERS = (
+    "invalid session id", "session deleted", "chrome not reachable", "disconnected", "no such window",
+    "target window already closed", "connection refused", "max retries exceeded",
+)
+
+BLOCK_PAGE_MARKERS = ("anomaly-modal", "captcha", "unusual traffic", "detected unusual activity")
+BLOCK_STATUS_CODES = (202, 403, 429)
+
+def looks_blocked(html):
+    """Whether a page looks like a bot check rather than search results"""
+    text = html.lower()
+    return any(marker in text for marker in BLOCK_PAGE_MARKERS)
+
+def selenium_errors(*names):
+    """Selenium exception classes by name; () until selenium is imported, since nothing can have raised one"""
+    module = sys.modules.get("selenium.common.exceptions")
+    return tuple(getattr(module, name) for name in names) if module else ()
+
+def is_dead_session(exc):
+    """Whether an exception raised while driving a browser means its session is gone"""
+    if isinstance(exc, selenium_errors("InvalidSessionIdException", "NoSuchWindowException") + (DriverCrashedError,)):
+        return True
+    if isinstance(exc, selenium_errors("TimeoutException") + (LookupFailure,)):
+        return False
+    # A dead chromedriver surfaces as connection errors from selenium's HTTP client
+    if isinstance(exc, selenium_errors("WebDriverException") + (ConnectionError,)) or type(exc).__module__.startswith("urllib3"):
+        message = str(exc).lower()
+        return any(marker in message for marker in DEAD_SESSION_MARKERS)
+    return False
+
+def to_failure(exc):
+    """The LookupFailure describing an exception raised during a lookup"""
+    if isinstance(exc, LookupFailure):
+        return exc
+    message = f"{type(exc).__name__}: {exc}"[:300]
+    if isinstance(exc, urllib.error.HTTPError):
+        if exc.code in BLOCK_STATUS_CODES:
+            return SearchBlockedError(message)
+        return SearchNetworkError(message, retryable=exc.code >= 500)
+    if isinstance(exc, selenium_errors("WebDriverException")) and is_dead_session(exc):
+        return DriverCrashedError(message)
+    # A connect timeout arrives wrapped in a URLError; socket.timeout isn't a TimeoutError before Python 3.10
+    reason = exc.reason if isinstance(exc, urllib.error.URLError) else exc
+    if isinstance(reason, selenium_errors("TimeoutException") + (TimeoutError, socket.timeout, asyncio.TimeoutError)):
+        return SearchTimeoutError(message)
+    if isinstance(exc, (urllib.error.URLError, ConnectionError)):
+        return SearchNetworkError(message)
+    # Anything else is most likely a bug or a layout change; retrying won't help
+    return LookupFailure(message)
+
+def classify_failure(exc):
+    """Map a lookup exception to an outcome reason for throttling decisions"""
+    return to_failure(exc).reason
+
+def retry_delay(attempts, base=RETRY_BASE_DELAY, maximum=RETRY_MAX_DELAY):
+    """Exponential backoff with jitter before the retry that follows attempts failed lookups"""
+    delay = min(maximum, base * 2 ** max(0, attempts - 1))
+    return random.uniform(delay / 2, delay)
+
+def cache_key(name, company):
+    """Normalized cache key for a reviewer name and (already comma-split) company"""
+    return f"{' '.join(name.lower().split())}|{' '.join(company.lower().split())}"
+
+class LookupCache:
+    """Persistent SQLite cache of search results keyed on normalized name and company"""
+
+    def __init__(self, path=LOOKUP_CACHE_PATH, ttl_found=LOOKUP_CACHE_TTL_FOUND,
+                 ttl_not_found=LOOKUP_CACHE_TTL_NOT_FOUND, max_entries=LOOKUP_CACHE_MAX_ENTRIES,
+                 max_candidates=LOOKUP_CACHE_MAX_CANDIDATES):
+        self.ttl_found = ttl_found
+        self.ttl_not_found = ttl_not_found
+        self.max_entries = max_entries
+        self.max_candidates = max_candidates
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS lookups ("
+            "key TEXT PRIMARY KEY, result TEXT NOT NULL, stored_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS lookups_last_used ON lookups (last_used)")
+        # Replaces an unbounded table that also held snippets and non-profile results
+        self._conn.execute("DROP TABLE IF EXISTS candidates")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS profile_candidates (key TEXT PRIMARY KEY, results TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS profile_candidates_stored_at ON profile_candidates (stored_at)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM lookups").fetchone()[0]
+        self._candidates_size = self._conn.execute("SELECT COUNT(*) FROM profile_candidates").fetchone()[0]
+
+    def get(self, name, company):
+        """Return a cached, unexpired result or None"""
+        key = cache_key(name, company)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT result, stored_at FROM lookups WHERE key = ?", (key,)).fetchone()
+            if row and now - row[1] < self._ttl(row[0]):
+                self._conn.execute("UPDATE lookups SET last_used = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+                self.hits += 1
+                return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, name, company, result, candidates=None):
+        """Store a profile link or "Not Found" (and its search results); errors and anonymous rows are never cached"""
+        if result in ("Error", "Anonymous"):
+            return
+        now = time.time()
+        key = cache_key(name, company)
+        with self._lock:
+            exists = self._conn.execute("SELECT 1 FROM lookups WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lookups (key, result, stored_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, result, now, now),
+            )
+            if not exists:
+                self._size += 1
+            profiles = [
+                {"href": c["href"], "title": c["title"][:CACHED_TITLE_CHARS]}
+                for c in candidates or () if "linkedin.com/in/" in c["href"]
+            ]
+            if profiles:
+                exists = self._conn.execute("SELECT 1 FROM profile_candidates WHERE key = ?", (key,)).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO profile_candidates (key, results, stored_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(profiles), now),
+                )
+                if not exists:
+                    self._candidates_size += 1
+            if self._size > self.max_entries or self._candidates_size > self.max_candidates:
+                self._evict()
+            self._conn.commit()
+
+    def get_candidates(self, name, company):
+        """LinkedIn profile results ({href, title}) stored with a lookup, for re-ranking without searching again"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT results FROM profile_candidates WHERE key = ?", (cache_key(name, company),)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def stats(self):
+        """Hit/miss counters for display"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": self._size}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _ttl(self, result):
+        return self.ttl_not_found if result == "Not Found" else self.ttl_found
+
+    def _evict(self):
+        # Drop expired entries first, then the least recently used down to 90% of capacity
+        now = time.time()
+        self._conn.execute(
+            "DELETE FROM lookups WHERE (result = 'Not Found' AND stored_at < ?) OR stored_at < ?",
+            (now - self.ttl_not_found, now - self.ttl_found),
+        )
+        excess = self._conn.execute("SELECT COUNT(*) FROM lookups").fetchone()[0] - int(self.max_entries * 0.9)
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM lookups WHERE key IN (SELECT key FROM lookups ORDER BY last_used LIMIT ?)", (excess,)
+            )
+        self._conn.execute("DELETE FROM profile_candidates WHERE key NOT IN (SELECT key FROM lookups)")
+        excess = self._conn.execute("SELECT COUNT(*) FROM profile_candidates").fetchone()[0] - int(self.max_candidates * 0.9)
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM profile_candidates WHERE key IN "
+                "(SELECT key FROM profile_candidates ORDER BY stored_at LIMIT ?)", (excess,)
+            )
+        self._size = self._conn.execute("SELECT COUNT(*) FROM lookups").fetchone()[0]
+        self._candidates_size = self._conn.execute("SELECT COUNT(*) FROM profile_candidates").fetchone()[0]
+
+@st.cache_resource
+def get_lookup_cache():
+    """Process-wide lookup cache that survives Streamlit reruns"""
+    cache = LookupCache()
+    atexit.register(cache.close)
+    return cache
+
+MAX_CANDIDATES = 10  # Search results kept per lookup for later re-ranking
+MAX_SNIPPET_CHARS = 300
+
+# Collects every result's href, title and snippet in a single WebDriver round trip
+EXTRACT_RESULTS_JS = """
+const clip = (text, limit) => (text || "").replace(/\\s+/g, " ").trim().slice(0, limit);
+const results = [];
+for (const el of document.querySelectorAll(".result, [data-testid='result']")) {
+    const link = el.querySelector("a.result__a, a[data-testid='result-title-a'], h2 a, a[href]");
+    if (!link) continue;
+    const snippet = el.querySelector(".result__snippet, [data-result='snippet'], [data-testid='result-snippet']");
+    results.push({href: link.href, title: clip(link.textContent, 200), snippet: clip(snippet && snippet.textContent, arguments[1])});
+    if (results.length >= arguments[0]) break;
+}
+if (!results.length) {
+    for (const link of document.querySelectorAll("a[href*='linkedin.com']")) {
+        results.push({href: link.href, title: clip(link.textContent, 200), snippet: ""});
+        if (results.length >= arguments[0]) break;
+    }
+}
+return results;
+"""
+
+def normalize_candidates(candidates):
+    """Unwrap redirect links and trim a list of {href, title, snippet} results"""
+    return [
+        {
+            "href": unwrap_result_url(c.get("href") or ""),
+            "title": (c.get("title") or "").strip(),
+            "snippet": (c.get("snippet") or "").strip()[:MAX_SNIPPET_CHARS],
+        }
+        for c in candidates[:MAX_CANDIDATES]
+    ]
+
+def pick_profile(candidates):
+    """First candidate that links to a LinkedIn profile, or None"""
+    for candidate in candidates:
+        if "linkedin.com/in/" in candidate["href"]:
+            return candidate["href"]
+    return None
+
+class SearchResolver:
+    """Base class for LinkedIn profile search backends"""
+
+    name = "base"
+    host = ""
+
+    def search_candidates(self, query):
+        """Return the results for a query as a list of {href, title, snippet} dicts"""
+        raise NotImplementedError
+
+    async def search_candidates_async(self, query):
+        """Coroutine version of search_candidates; blocking backends run in a worker thread"""
+        return await asyncio.to_thread(self.search_candidates, query)
+
+    def search(self, query):
+        """Return the first linkedin.com/in/ link for a query, or None"""
+        return pick_profile(self.search_candidates(query))
+
+    def close(self):
+        """Release any resources held by the resolver"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def results_rendered(driver):
+    """Wait condition: a results page has rendered, with or without LinkedIn hits"""
+    from selenium.webdriver.common.by import By
+
+    return bool(driver.find_elements(By.CSS_SELECTOR, RESULTS_RENDERED_SELECTOR))
+
+class SeleniumResolver(SearchResolver):
+    """Search DuckDuckGo in headless Chrome, using a fixed driver or the shared pool
+
+    "direct" navigation loads the results URL in one request; "form" types the
+    query into the homepage search box like a user would.
+    """
+
+    name = "selenium"
+
+    def __init__(self, driver=None, pool=None, navigation=SEARCH_NAVIGATION):
+        self.driver = driver
+        self.pool = pool
+        self.navigation = navigation
+        self.host = urllib.parse.urlparse(SEARCH_RESULTS_URL if navigation == "direct" else SEARCH_HOME_URL).netloc
+
+    def search_candidates(self, query):
+        try:
+            if self.driver is not None:
+                return self._search(self.driver, query)
+            with self.pool.lease() as driver:
+                return self._search(driver, query)
+        except LookupFailure:
+            raise
+        except Exception as e:
+            if is_dead_session(e):
+                raise DriverCrashedError(f"{type(e).__name__}: {e}"[:300]) from e
+            raise
+
+    def _search(self, driver, query):
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.wait import WebDriverWait
+
+        with trace_phase("page_load"):
+            if self.navigation == "direct":
+                driver.get(f"{SEARCH_RESULTS_URL}?{urllib.parse.urlencode({'q': query})}")
+            else:
+                self._submit_form(driver, query)
+
+        # Return as soon as results render instead of waiting out a timeout on misses
+        with trace_phase("render_wait"):
+            try:
+                WebDriverWait(driver, 5, poll_frequency=0.1).until(results_rendered)
+            except TimeoutException as e:
+                if looks_blocked(driver.page_source):
+                    raise SearchBlockedError("Results page replaced by a bot check") from e
+                raise SearchTimeoutError("Results page did not render in time") from e
+
+        with trace_phase("extract"):
+            return normalize_candidates(driver.execute_script(EXTRACT_RESULTS_JS, MAX_CANDIDATES, MAX_SNIPPET_CHARS) or [])
+
+    def _submit_form(self, driver, query):
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.keys import Keys
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.wait import WebDriverWait
+
+        driver.get(SEARCH_HOME_URL)
+        try:
+            search_box = WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.NAME, "q")))
+        except TimeoutException:
+            if looks_blocked(driver.page_source):
+                raise SearchBlockedError("Search page replaced by a bot check")
+            raise SearchBoxMissingError("Search box did not appear")
         search_box.clear()
         search_box.send_keys(query + Keys.RETURN)
 
-        WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.XPATH, "//a[contains(@href, 'linkedin.com/in/')]"))
-        )
-        
-        links = driver.find_elements(By.XPATH, "//a[contains(@href, 'linkedin.com/in/')]")
-        href = links[0].get_attribute("href") if links else None
-        
-        if href:
-            return href
+class _ResultParser(HTMLParser):
+    """Collect result titles, links and snippets (plus every anchor) from an HTML results page"""
+
+    def __init__(self):
+        super().__init__()
+        self.results = []
+        self.hrefs = []
+        self._field = None
+        self._field_tag = None
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        if tag == "a" and attrs.get("href"):
+            self.hrefs.append(attrs["href"])
+        if self._field:
+            return
+        if tag == "a" and "result__a" in classes:
+            self.results.append({"href": attrs.get("href") or "", "title": "", "snippet": ""})
+            self._start("title", tag)
+        elif "result__snippet" in classes and self.results:
+            self._start("snippet", tag)
+
+    def handle_endtag(self, tag):
+        if self._field and tag == self._field_tag:
+            self.results[-1][self._field] = " ".join("".join(self._text).split())
+            self._field = None
+
+    def handle_data(self, data):
+        if self._field:
+            self._text.append(data)
+
+    def _start(self, field, tag):
+        self._field = field
+        self._field_tag = tag
+        self._text = []
+
+def unwrap_result_url(href):
+    """Decode DuckDuckGo's /l/?uddg= redirect links to the target URL"""
+    parsed = urllib.parse.urlparse(href)
+    if parsed.path.endswith("/l/"):
+        target = urllib.parse.parse_qs(parsed.query).get("uddg")
+        if target:
+            return target[0]
+    return href
+
+class HttpResolver(SearchResolver):
+    """Fetch DuckDuckGo's HTML results endpoint and parse links without a browser"""
+
+    name = "http"
+
+    def __init__(self, search_url=HTTP_SEARCH_URL, timeout=HTTP_TIMEOUT):
+        self.search_url = search_url
+        self.timeout = timeout
+        self.host = urllib.parse.urlparse(search_url).netloc
+
+    def search_candidates(self, query):
+        request = urllib.request.Request(self._query_url(query), headers={"User-Agent": random.choice(USER_AGENTS)})
+        with trace_phase("page_load"), urllib.request.urlopen(request, timeout=self.timeout) as response:
+            if response.status in BLOCK_STATUS_CODES:
+                raise SearchBlockedError(f"Search returned HTTP {response.status}")
+            html = response.read().decode(response.headers.get_content_charset() or "utf-8", "replace")
+        with trace_phase("extract"):
+            return self.parse_candidates(html)
+
+    async def search_candidates_async(self, query):
+        headers = {"User-Agent": random.choice(USER_AGENTS)}
+        with trace_phase("page_load"):
+            html = await asyncio.wait_for(http_get_async(self._query_url(query), headers), self.timeout)
+        with trace_phase("extract"):
+            return self.parse_candidates(html)
+
+    def _query_url(self, query):
+        return f"{self.search_url}?{urllib.parse.urlencode({'q': query})}"
+
+    @staticmethod
+    def parse_candidates(html):
+        parser = _ResultParser()
+        parser.feed(html)
+        candidates = parser.results
+        if not candidates:
+            # Unknown layout: fall back to any LinkedIn anchor on the page
+            candidates = [{"href": href} for href in parser.hrefs if "linkedin.com" in unwrap_result_url(href)]
+        candidates = normalize_candidates(candidates)
+        if pick_profile(candidates) is None and looks_blocked(html):
+            raise SearchBlockedError("Results page replaced by a bot check")
+        return candidates
+
+async def http_get_async(url, headers=None):
+    """Minimal non-blocking HTTP/1.0 GET returning the decoded body of a 200 response"""
+    parsed = urllib.parse.urlparse(url)
+    secure = parsed.scheme == "https"
+    port = parsed.port or (443 if secure else 80)
+    path = parsed.path or "/"
+    if parsed.query:
+        path += f"?{parsed.query}"
+
+    reader, writer = await asyncio.open_connection(
+        parsed.hostname, port, ssl=ssl.create_default_context() if secure else None
+    )
+    try:
+        request_headers = {"Host": parsed.netloc, "Accept-Encoding": "identity", "Connection": "close"}
+        request_headers.update(headers or {})
+        request = f"GET {path} HTTP/1.0\r\n" + "".join(f"{k}: {v}\r\n" for k, v in request_headers.items()) + "\r\n"
+        writer.write(request.encode("latin-1"))
+        await writer.drain()
+        raw = await reader.read()
+    finally:
+        writer.close()
+
+    head, _, body = raw.partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    status = int(status_line.split()[1])
+    if status != 200:
+        raise urllib.error.HTTPError(url, status, status_line, None, None)
+    response_headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(":") for line in header_lines)}
+    if response_headers.get("transfer-encoding", "").lower() == "chunked":
+        body = _dechunk(body)
+    return body.decode("utf-8", "replace")
+
+def _dechunk(body):
+    chunks = []
+    while body:
+        size_line, _, body = body.partition(b"\r\n")
+        size = int(size_line.split(b";")[0], 16)
+        if size == 0:
+            break
+        chunks.append(body[:size])
+        body = body[size + 2:]
+    return b"".join(chunks)
+
+RESOLVER_BACKENDS = {
+    "selenium": lambda: SeleniumResolver(pool=get_driver_pool()),
+    "http": HttpResolver,
+}
+
+def search_host(backend=SEARCH_BACKEND):
+    """Host a backend sends its searches to, used to key the rate limiter"""
+    if backend == "http":
+        url = HTTP_SEARCH_URL
+    else:
+        url = SEARCH_RESULTS_URL if SEARCH_NAVIGATION == "direct" else SEARCH_HOME_URL
+    return urllib.parse.urlparse(url).netloc
+
+def get_resolver(backend=SEARCH_BACKEND):
+    """Create a resolver for the named search backend"""
+    if backend not in RESOLVER_BACKENDS:
+        raise ValueError(f"Unknown search backend '{backend}', expected one of {sorted(RESOLVER_BACKENDS)}")
+    return RESOLVER_BACKENDS[backend]()
+
+def normalize_company(raw_company):
+    """Keep the part after the last comma, e.g. 'CEO, Acme Inc' -> 'Acme Inc'"""
+    company = str(raw_company)
+    return company.split(",")[-1].strip() if "," in company else company.strip()
+
+def build_query(name, company):
+    """Search query used to find a reviewer's LinkedIn profile"""
+    return f"{name} {company} site:linkedin.com/in"
+
+def prepare_row(row):
+    """Return the (name, company) to search for, or None for anonymous reviewers"""
+    name = str(row['Reviewer Name']).strip()
+    if name.lower() == "anonymous":
+        return None
+    return name, normalize_company(row['Reviewer Company'])
+
+def _settle_trace(trace, result):
+    trace.outcome = "not_found" if result == "Not Found" else "found"
+    trace.reason = "ok"
+
+def _fail_trace(trace, exc, reason):
+    trace.outcome, trace.reason = "error", reason
+    trace.error = f"{type(exc).__name__}: {exc}"[:300]
+
+def process_row(row, resolver, throttle=None, jitter=None, cache=None, raise_failures=False, on_search=None):
+    """Process a single row with a resolver (or an existing driver), recording its timing spans
+
+    A failed lookup returns "Error", or raises its LookupFailure when raise_failures
+    is set so the caller can decide whether to retry. on_search is called once
+    the lookup is through the rate limiter, right before the resolver is queried.
+    """
+    with row_trace() as trace:
+        prepared = prepare_row(row)
+        if prepared is None:
+            trace.outcome, trace.reason = "anonymous", "ok"
+            return "Anonymous"
+        trace.query = build_query(*prepared)
+
+        if cache:
+            with trace_phase("cache_lookup"):
+                cached = cache.get(*prepared)
+            if cached:
+                trace.outcome, trace.reason = "cached", "ok"
+                return cached
+
+        if not isinstance(resolver, SearchResolver):
+            resolver = SeleniumResolver(driver=resolver)
+
+        try:
+            with throttle.slot() if throttle else contextlib.nullcontext():
+                if throttle:
+                    with trace_phase("throttle_wait"):
+                        throttle.acquire(jitter)
+                if on_search:
+                    on_search()
+                candidates = resolver.search_candidates(trace.query)
+            href = pick_profile(candidates)
+            result = href if href else "Not Found"
+            if throttle:
+                throttle.record("ok")
+            if cache:
+                with trace_phase("cache_store"):
+                    cache.put(*prepared, result, candidates)
+            _settle_trace(trace, result)
+            return result
+
+        except DriverUnavailableError as e:
+            _fail_trace(trace, e, "driver_unavailable")
+            raise
+        except Exception as e:
+            failure = to_failure(e)
+            _fail_trace(trace, e, failure.reason)
+            if throttle:
+                throttle.record(failure.reason)
+            if raise_failures:
+                if failure is e:
+                    raise
+                raise failure from e
+            return "Error"
+
+async def process_row_async(row, resolver, throttle=None, jitter=None, cache=None, raise_failures=False, on_search=None):
+    """Coroutine version of process_row returning the same result values"""
+    with row_trace() as trace:
+        prepared = prepare_row(row)
+        if prepared is None:
+            trace.outcome, trace.reason = "anonymous", "ok"
+            return "Anonymous"
+        trace.query = build_query(*prepared)
+
+        if cache:
+            with trace_phase("cache_lookup"):
+                cached = cache.get(*prepared)
+            if cached:
+                trace.outcome, trace.reason = "cached", "ok"
+                return cached
+
+        try:
+            async with throttle.slot_async() if throttle else _async_nullcontext():
+                if throttle:
+                    with trace_phase("throttle_wait"):
+                        await throttle.acquire_async(jitter)
+                if on_search:
+                    on_search()
+                candidates = await resolver.search_candidates_async(trace.query)
+            href = pick_profile(candidates)
+            result = href if href else "Not Found"
+            if throttle:
+                throttle.record("ok")
+            if cache:
+                with trace_phase("cache_store"):
+                    cache.put(*prepared, result, candidates)
+            _settle_trace(trace, result)
+            return result
+        except DriverUnavailableError as e:
+            _fail_trace(trace, e, "driver_unavailable")
+            raise
+        except Exception as e:
+            failure = to_failure(e)
+            _fail_trace(trace, e, failure.reason)
+            if throttle:
+                throttle.record(failure.reason)
+            if raise_failures:
+                if failure is e:
+                    raise
+                raise failure from e
+            return "Error"
+
+def upload_checkpoint_id(fileobj, block_size=1 << 20):
+    """Content hash identifying an upload across reruns and restarts"""
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    for block in iter(lambda: fileobj.read(block_size), b""):
+        digest.update(block)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+class Checkpoint:
+    """Query results recorded for one upload, in SQLite so a resume reads back only the keys it needs"""
+
+    def __init__(self, checkpoint_id, directory=CHECKPOINT_DIR):
+        self.path = Path(directory) / f"{checkpoint_id}.sqlite3"
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def exists(self):
+        return self.path.exists()
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")  # Survives the process dying, which is what resumes are for
+            self._conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT NOT NULL)")
+            self._conn.commit()
+        return self._conn
+
+    def lookup(self, keys, batch=500):
+        """Recorded results for those of keys that have one"""
+        keys = list(keys)
+        found = {}
+        if not keys or not self.exists():
+            return found
+        with self._lock:
+            conn = self._connect()
+            for i in range(0, len(keys), batch):
+                part = keys[i:i + batch]
+                query = f"SELECT key, result FROM results WHERE key IN ({','.join('?' * len(part))})"
+                found.update(conn.execute(query, part).fetchall())
+        return found
+
+    def count(self):
+        if not self.exists():
+            return 0
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def record(self, key, result):
+        """Store a result; errors are left out so they are retried on resume"""
+        if result == "Error":
+            return
+        with self._lock:
+            conn = self._connect()
+            conn.execute("INSERT OR REPLACE INTO results (key, result) VALUES (?, ?)", (key, result))
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def remove(self):
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{self.path}{suffix}").unlink(missing_ok=True)
+
+_open_checkpoints = {}  # Checkpoint path -> [Checkpoint, files using it, whether one stopped unfinished]
+_open_checkpoints_lock = threading.Lock()
+
+def open_checkpoint(checkpoint_id, directory=CHECKPOINT_DIR):
+    """Checkpoint shared by every file with the same content being processed, in this job or a concurrent one"""
+    checkpoint = Checkpoint(checkpoint_id, directory)
+    with _open_checkpoints_lock:
+        entry = _open_checkpoints.setdefault(checkpoint.path, [checkpoint, 0, False])
+        entry[1] += 1
+        return entry[0]
+
+def release_checkpoint(checkpoint, finished=True):
+    """Give back a checkpoint from open_checkpoint; the last file to let go removes it unless one didn't finish"""
+    with _open_checkpoints_lock:
+        entry = _open_checkpoints[checkpoint.path]
+        entry[1] -= 1
+        entry[2] = entry[2] or not finished
+        if entry[1]:
+            return
+        del _open_checkpoints[checkpoint.path]
+        # Still under the lock, so nobody reopens the file while it is deleted
+        if entry[2]:
+            checkpoint.close()
         else:
-            return "Not Found"
-            
-    except Exception as e:
-        return "Error"
+            checkpoint.remove()
+
+class BoundedResults(collections.OrderedDict):
+    """Query results dict that forgets its oldest entries beyond maxsize"""
+
+    def __init__(self, maxsize=KNOWN_RESULTS_MAX):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+def _normalize_text(series):
+    """Vectorized equivalent of ' '.join(value.lower().split())"""
+    return series.str.replace(r"\s+", " ", regex=True).str.strip().str.lower()
+
+def plan_queries(frames):
+    """Build lookup keys for every row and the unique set of queries across all frames
+
+    Returns one key Series per frame (NaN for anonymous reviewers) and a dataframe
+    of unique 'Reviewer Name'/'Reviewer Company' pairs indexed by key.
+    """
+    frame_keys = []
+    unique_queries = []
+    for df in frames:
+        names = df['Reviewer Name'].astype(str).str.strip()
+        companies = df['Reviewer Company'].astype(str).str.split(",").str[-1].str.strip()
+        keys = _normalize_text(names) + "|" + _normalize_text(companies)
+        keys = keys.mask(names.str.lower() == "anonymous")
+        frame_keys.append(keys)
+        queries = pd.DataFrame({'key': keys, 'Reviewer Name': names, 'Reviewer Company': companies})
+        unique_queries.append(queries.dropna(subset=['key']).drop_duplicates('key'))
+
+    if unique_queries:
+        work = pd.concat(unique_queries).drop_duplicates('key').set_index('key')
+    else:
+        work = pd.DataFrame(columns=['Reviewer Name', 'Reviewer Company'])
+    return frame_keys, work
+
+def fan_out_results(keys, results_by_key):
+    """Map per-query results back onto every row that shares the query"""
+    return keys.map(results_by_key).where(keys.notna(), "Anonymous").fillna("Error")
+
+# Tags that end a line in a browser's innerText, which the userscript split reviewer cards on
+TEXT_BREAK_TAGS = {
+    "address", "article", "blockquote", "br", "dd", "div", "dl", "dt", "figure", "footer", "h1", "h2", "h3", "h4",
+    "h5", "h6", "header", "li", "ol", "p", "section", "table", "td", "th", "tr", "ul",
+}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+class _ReviewPageParser(HTMLParser):
+    """Collect review cards, the company name, the last page number and directory profile links from a Clutch page"""
+
+    def __init__(self):
+        super().__init__()
+        self.company = None
+        self.reviews = []
+        self.last_page = 0
+        self.profile_links = []
+        self._stack = []
+        self._open = collections.Counter()
+        self._card = []
+        self._title = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = set((attrs.get("class") or "").split())
+        element_id = attrs.get("id") or ""
+        if tag == "a" and attrs.get("href") and {"provider__cta-link", "directory_profile"} <= classes:
+            self.profile_links.append(attrs["href"])
+        if tag == "a" and "sg-pagination__link--icon-last" in classes:
+            self.last_page = last_page_number(attrs)
+        if tag in VOID_TAGS:
+            if tag == "br" and self._open["reviewer"]:
+                self._card.append("\n")
+            return
+
+        role = None
+        if element_id == "reviews-sg-accordion":
+            role = "accordion"
+        elif self._open["accordion"] and not self._open["review"] and element_id.startswith("review-"):
+            role = "review"
+            self.reviews.append((element_id[len("review-"):], None))
+        elif self._open["review"] and not self._open["reviewer"] and {"profile-review__reviewer", "mobile_hide"} <= classes:
+            role = "reviewer"
+            self._card = []
+        elif tag == "h1" and self.company is None and not self._open["h1"]:
+            role = "h1"
+            self._title = []
+        self._stack.append((tag, role))
+        self._open[role] += 1
+        if self._open["reviewer"] and tag in TEXT_BREAK_TAGS:
+            self._card.append("\n")
+
+    def handle_endtag(self, tag):
+        if all(open_tag != tag for open_tag, _ in self._stack):
+            return
+        # Elements left open inside this one (e.g. a <p> or <li> without its end tag) end with it
+        while self._stack:
+            open_tag, role = self._stack.pop()
+            if self._open["reviewer"] and open_tag in TEXT_BREAK_TAGS:
+                self._card.append("\n")
+            self._open[role] -= 1
+            if role == "reviewer":
+                review_id, _ = self.reviews[-1]
+                self.reviews[-1] = (review_id, review_row(innertext_lines("".join(self._card))))
+            elif role == "h1":
+                self.company = " ".join("".join(self._title).split()) or None
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._open["reviewer"]:
+            # Source newlines are just whitespace; only element boundaries break lines
+            self._card.append(data.replace("\r", " ").replace("\n", " "))
+        if self._open["h1"]:
+            self._title.append(data)
+
+    def close(self):
+        super().close()
+        # Cards without a reviewer section are skipped, as the userscript did
+        self.reviews = [(review_id, row) for review_id, row in self.reviews if row is not None]
+
+def last_page_number(attrs):
+    """Page number of a pagination "last" link, as its href passes it in REVIEW_PAGE_PARAM
+
+    Reading the number from the link the site itself generates keeps harvesting
+    right whether pages count from 0 or 1; data-page (what the userscript read)
+    is only a fallback.
+    """
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(attrs.get("href") or "").query)
+    for value in query.get(REVIEW_PAGE_PARAM, []) + [attrs.get("data-page") or ""]:
+        if value.isdigit():
+            return int(value)
+    return 0
+
+def innertext_lines(text):
+    """Non-empty, whitespace-collapsed lines of text"""
+    return [" ".join(line.split()) for line in text.split("\n") if line.strip()]
+
+def review_row(lines):
+    """Map a reviewer card's lines to REVIEW_COLUMNS exactly as clutch-extension.js did
+
+    The card opens with the reviewer's title and company, then their name, which
+    is why the userscript's "swapped" headers put lines[0] under Reviewer Company.
+    """
+    return dict(zip(REVIEW_COLUMNS, (lines[i] if i < len(lines) else "N/A" for i in (0, 1, 3, 4, 5))))
+
+def parse_review_page(html):
+    """Parse a Clutch profile or directory page; the parser's company, reviews, last_page and profile_links hold the results"""
+    parser = _ReviewPageParser()
+    parser.feed(html)
+    parser.close()
+    return parser
+
+def review_page_url(profile_url, page):
+    """URL of one review page of a profile; page 0 leaves the page parameter out"""
+    parsed = urllib.parse.urlparse(profile_url)
+    query = [(k, v) for k, v in urllib.parse.parse_qsl(parsed.query) if k != REVIEW_PAGE_PARAM]
+    if page:
+        query.append((REVIEW_PAGE_PARAM, str(page)))
+    return urllib.parse.urlunparse(parsed._replace(query=urllib.parse.urlencode(query)))
+
+def is_remote(url):
+    return urllib.parse.urlparse(url).scheme in ("http", "https")
+
+def fetch_page(url, timeout=HTTP_TIMEOUT):
+    """Fetch a page over HTTP, or read a saved copy when url is a local path"""
+    if "://" not in url:
+        return Path(url).read_text(encoding="utf-8", errors="replace")
+    request = urllib.request.Request(url, headers={"User-Agent": random.choice(USER_AGENTS)})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        if getattr(response, "status", 200) in BLOCK_STATUS_CODES:
+            raise SearchBlockedError(f"Clutch returned HTTP {response.status}")
+        return response.read().decode(response.headers.get_content_charset() or "utf-8", "replace")
+
+FILENAME_UNSAFE = str.maketrans({c: "_" for c in '\\/:*?"<>|'})
+
+def review_filename(company):
+    """CSV name the userscript downloaded a company's reviews as"""
+    return f"{company.translate(FILENAME_UNSAFE)}_reviews.csv"
+
+class ReviewHarvester:
+    """Fetch Clutch review pages concurrently and collect each company's reviews once per review id
+
+    Inputs are profile URLs, directory URLs whose profile links are followed, or
+    saved pages. A profile's remaining pages are all requested as soon as its
+    first page gives the page count, through the host's shared rate limiter, in
+    place of the userscript's serial clicks and fixed delays. fetch takes a URL
+    or path and returns its HTML, so saved fixtures can stand in for the site.
+    """
+
+    def __init__(self, fetch=fetch_page, workers=HARVEST_WORKERS, max_attempts=RETRY_MAX_ATTEMPTS):
+        self.fetch = fetch
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.pages = 0
+        self.duplicates = 0
+        self.failures = []  # (url, reason, error) of pages given up on
+        self._seen = set()
+        self._companies = {}  # profile -> (company name, {position: rows})
+
+    def harvest(self, urls, progress_callback=None):
+        """Harvest every input and return {filename: dataframe of REVIEW_COLUMNS}, one per company"""
+        throttles = {}  # host -> rate limiter
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = {}
+
+            # Positions are tuples (input, directory link, page) that restore input order once pages arrive out of order
+            def submit(url, kind, position, profile=None):
+                throttle = None
+                if is_remote(url):
+                    host = urllib.parse.urlparse(url).netloc
+                    throttle = throttles[host] = throttles.get(host) or get_token_bucket(host)
+                pending[executor.submit(self._fetch, url, throttle)] = (url, kind, position, profile)
+
+            for i, url in enumerate(urls):
+                submit(str(url), "input", (i,))
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, kind, position, profile = pending.pop(future)
+                    try:
+                        page = future.result()
+                    except LookupFailure as failure:
+                        self.failures.append((url, failure.reason, str(failure)))
+                        continue
+                    self.pages += 1
+                    if kind == "input" and page.profile_links and not page.reviews:
+                        # A directory page: its profiles are harvested, their own links aren't followed
+                        base = url if is_remote(url) else CLUTCH_SITE_URL
+                        links = (urllib.parse.urldefrag(urllib.parse.urljoin(base, link))[0] for link in page.profile_links)
+                        for j, link in enumerate(dict.fromkeys(links)):
+                            submit(link, "profile", position + (j,))
+                    elif kind == "page":
+                        self._add(profile, page, position)
+                    else:
+                        profile = url if is_remote(url) else f"saved:{page.company or Path(url).stem}"
+                        if is_remote(url):
+                            for number in range(1, page.last_page + 1):
+                                submit(review_page_url(url, number), "page", position + (number,), profile)
+                        self._add(profile, page, position + (0,))
+                    if progress_callback:
+                        progress_callback(self.pages + len(self.failures), self.pages + len(self.failures) + len(pending))
+        return self._frames()
+
+    def _fetch(self, url, throttle=None):
+        """Fetch and parse one page through its host's rate limiter, retrying transient failures"""
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                with throttle.slot() if throttle else contextlib.nullcontext():
+                    if throttle:
+                        throttle.acquire()
+                    html = self.fetch(url)
+                page = parse_review_page(html)
+                if throttle and not (page.reviews or page.profile_links) and looks_blocked(html):
+                    raise SearchBlockedError("Review page replaced by a bot check")
+            except Exception as exc:
+                failure = to_failure(exc)
+                if throttle:
+                    throttle.record(failure.reason)
+                if failure.retryable and attempts < self.max_attempts:
+                    time.sleep(retry_delay(attempts))
+                    continue
+                get_metrics().inc("clutch_harvested_pages_total", outcome="error", reason=failure.reason)
+                raise failure
+            if throttle:
+                throttle.record("ok")
+            get_metrics().inc("clutch_harvested_pages_total", outcome="ok", reason="ok")
+            return page
+
+    def _add(self, profile, page, position):
+        rows = []
+        for review_id, row in page.reviews:
+            if review_id in self._seen:
+                self.duplicates += 1
+                continue
+            self._seen.add(review_id)
+            rows.append(row)
+        company, pages = self._companies.setdefault(profile, (page.company, {}))
+        if company is None and page.company:
+            self._companies[profile] = (page.company, pages)
+        pages.setdefault(position, []).extend(rows)
+
+    def _frames(self):
+        rows_by_file = {}
+        companies = sorted(self._companies.values(), key=lambda company: min(company[1]))
+        for i, (company, pages) in enumerate(companies):
+            rows = rows_by_file.setdefault(review_filename(company or f"company_{i + 1}"), [])
+            for position in sorted(pages):
+                rows.extend(pages[position])
+        return {name: pd.DataFrame(rows, columns=REVIEW_COLUMNS) for name, rows in rows_by_file.items()}
+
+def count_csv_rows(path, chunk_rows=STREAM_CHUNK_ROWS * 10):
+    """Count data rows without holding the file in memory"""
+    return sum(len(chunk) for chunk in pd.read_csv(path, usecols=[0], chunksize=chunk_rows))
+
+def write_processed_csv(input_path, output_path, results_by_key, chunk_rows=STREAM_CHUNK_ROWS):
+    """Stream input_path to output_path with a LinkedIn Profile column filled from resolved queries"""
+    written_rows = 0
+    for chunk in pd.read_csv(input_path, chunksize=chunk_rows):
+        (keys,), _ = plan_queries([chunk])
+        chunk['LinkedIn Profile'] = fan_out_results(keys, results_by_key).values
+        chunk.to_csv(output_path, mode="w" if written_rows == 0 else "a", header=written_rows == 0, index=False)
+        written_rows += len(chunk)
+
+    if written_rows == 0:
+        frame = pd.read_csv(input_path, nrows=0)
+        frame['LinkedIn Profile'] = []
+        frame.to_csv(output_path, index=False)
+    return written_rows
+
+FAILURE_COLUMNS = ['Failure Reason', 'Attempts', 'Last Error']
+
+def failed_path_for(output_path):
+    """Where the rows that failed for good are reported next to an output file"""
+    output_path = Path(output_path)
+    name = output_path.name
+    name = "failed_" + (name[len("processed_"):] if name.startswith("processed_") else name)
+    return output_path.with_name(name)
+
+def failed_rows(frame, keys, failures):
+    """Rows of frame whose query failed for good, with the failure columns added"""
+    failed = keys.isin(failures.keys()).values
+    if not failed.any():
+        return frame.iloc[0:0]
+    rows = frame[failed].copy()
+    details = [failures[key] for key in keys[failed]]
+    for column, values in zip(FAILURE_COLUMNS, zip(*details)):
+        rows[column] = values
+    return rows
+
+def append_failed_rows(path, rows):
+    """Append failed rows to a report, writing the header on first use; returns the row count"""
+    if rows.empty:
+        return 0
+    first = not Path(path).exists() or Path(path).stat().st_size == 0
+    rows.to_csv(path, mode="w" if first else "a", header=first, index=False)
+    return len(rows)
+
+def write_failed_rows(input_path, failed_path, failures, chunk_rows=STREAM_CHUNK_ROWS):
+    """Stream input_path and report its rows whose query failed for good; returns the row count"""
+    Path(failed_path).unlink(missing_ok=True)
+    if not failures:
+        return 0
+    written_rows = 0
+    for chunk in pd.read_csv(input_path, chunksize=chunk_rows):
+        (keys,), _ = plan_queries([chunk])
+        written_rows += append_failed_rows(failed_path, failed_rows(chunk, keys, failures))
+    return written_rows
+
+EXPORT_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+CONTENT_TYPES = {
+    ".csv": "text/csv",
+    ".parquet": "application/vnd.apache.parquet",
+    ".arrow": "application/vnd.apache.arrow.file",
+    ".zip": "application/zip",
+}
+
+def export_formats_available():
+    """Extra output formats this install can write (they need pyarrow)"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return []
+    return list(EXPORT_EXTENSIONS)
+
+def export_table(csv_path, output_format, block_size=EXPORT_BLOCK_BYTES):
+    """Convert a processed CSV to Parquet or an Arrow IPC file next to it, a block at a time
+
+    Every column is kept as text, exactly as in the CSV. Returns the new path.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+
+    csv_path = Path(csv_path)
+    output_path = csv_path.with_suffix(EXPORT_EXTENSIONS[output_format])
+    columns = pd.read_csv(csv_path, nrows=0).columns
+    reader = pa_csv.open_csv(
+        csv_path,
+        read_options=pa_csv.ReadOptions(block_size=block_size),
+        convert_options=pa_csv.ConvertOptions(column_types={c: pa.string() for c in columns}, strings_can_be_null=False),
+    )
+    if output_format == "parquet":
+        writer = pq.ParquetWriter(output_path, reader.schema)
+    else:
+        writer = pa.ipc.new_file(output_path, reader.schema)
+    with writer:
+        for batch in reader:
+            writer.write_table(pa.Table.from_batches([batch]))
+    return output_path
+
+def write_zip(paths, zip_path):
+    """Compress files into zip_path, streaming each from disk"""
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        for path in paths:
+            zip_file.write(path, Path(path).name)
+    return zip_path
+
+class ArtifactSink:
+    """Somewhere finished artifacts are copied to after they have been written locally"""
+
+    def put(self, path, name):
+        """Store the file at path under name; returns where it went"""
+        raise NotImplementedError
+
+class DirectorySink(ArtifactSink):
+    """Copy artifacts into a directory, e.g. a mounted volume"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def put(self, path, name):
+        destination = self.directory / name
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(path, destination)
+        return str(destination)
+
+class GcsSink(ArtifactSink):
+    """Upload artifacts to a Cloud Storage bucket with chunked, resumable uploads
+
+    With STORAGE_EMULATOR_HOST set the client talks to that local fake
+    bucket server anonymously instead of to Google.
+    """
+
+    def __init__(self, bucket, prefix="clutch_data", chunk_size=GCS_CHUNK_SIZE, client=None):
+        self.bucket_name = bucket
+        self.prefix = prefix.strip("/")
+        self.chunk_size = chunk_size
+        self._client = client
+
+    @functools.cached_property
+    def bucket(self):
+        if self._client is None:
+            from google.cloud import storage
+
+            if os.environ.get("STORAGE_EMULATOR_HOST"):
+                from google.auth.credentials import AnonymousCredentials
+
+                self._client = storage.Client(project="clutch-local", credentials=AnonymousCredentials())
+            else:
+                self._client = storage.Client()
+        return self._client.bucket(self.bucket_name)
+
+    def put(self, path, name):
+        blob = self.bucket.blob("/".join(filter(None, [self.prefix, name])), chunk_size=self.chunk_size)
+        blob.upload_from_filename(str(path), content_type=CONTENT_TYPES.get(Path(path).suffix, "application/octet-stream"))
+        return f"gs://{self.bucket_name}/{blob.name}"
+
+def artifact_sink(spec):
+    """Sink for a gs://bucket/prefix URL or a directory path"""
+    if spec.startswith("gs://"):
+        bucket, _, prefix = spec[len("gs://"):].partition("/")
+        return GcsSink(bucket, prefix)
+    return DirectorySink(spec)
+
+def publish_artifacts(paths, sinks, folder=""):
+    """Copy every artifact to every sink; returns ({file name: [locations]}, {file name: error})"""
+    published, errors = collections.defaultdict(list), {}
+    for path in map(Path, paths):
+        for sink in sinks:
+            try:
+                location = sink.put(path, "/".join(filter(None, [folder, path.name])))
+            except Exception as e:
+                errors[path.name] = f"{type(e).__name__}: {e}"[:300]
+                continue
+            published[path.name].append(location)
+    return dict(published), errors
+
+def static_url(path):
+    """Relative URL Streamlit's static file server streams path from, or None if it can't serve it"""
+    try:
+        relative = Path(path).resolve().relative_to(STATIC_DIR)
+    except ValueError:
+        return None
+    if not st.get_option("server.enableStaticServing") or Path(path).stat().st_size > STATIC_SERVING_MAX_BYTES:
+        return None
+    return f"app/static/{urllib.parse.quote(relative.as_posix())}"
+
+class _Chunk:
+    """A block of rows from one file waiting for its queries to resolve"""
+
+    def __init__(self, frame, keys):
+        self.frame = frame
+        self.keys = keys
+        self.results = {}
+        self.waiting = {}  # key -> number of rows in this chunk sharing it
+
+class FileJob:
+    """Progress and output of one file inside a LookupScheduler run"""
+
+    def __init__(self, name, input_path, output_path, total_rows=None, checkpoint=None, frame=None):
+        self.name = name
+        self.input_path = input_path
+        self.output_path = output_path
+        self.frame = frame  # Rows already in memory (e.g. harvested reviews), read instead of input_path
+        if total_rows is None:
+            total_rows = len(frame) if frame is not None else count_csv_rows(input_path)
+        self.total_rows = total_rows
+        self.checkpoint = checkpoint
+        self.failed_path = failed_path_for(output_path)
+        self.done_rows = 0
+        self.written_rows = 0
+        self.failed_rows = 0
+        self.failures = {}  # key -> (reason, attempts, last error) of queries that failed for good
+        self.completed = False
+        self._reader = None
+        self._exhausted = False
+        self._chunks = collections.deque()
+        self._chunk_count = 0
+
+class LookupScheduler:
+    """Serve the rows of many files from one prioritized work queue and one worker pool
+
+    Files are read in chunks and their unique queries are queued together, so
+    workers never idle at a file boundary. Queries are ordered by chunk number
+    and then file size, which interleaves files and lets small ones finish
+    first. Finished chunks are appended to each file's output in order.
+
+    Retryable failures wait out an exponential backoff in a retry heap and go
+    back into the queue; after max_attempts they are reported in each file's
+    failed_<name>.csv.
+
+    With max_workers=None the backend's WorkerGovernor decides how many of
+    the worker threads may look up at once, and changes that during the run.
+    With engine="async" a single thread instead keeps up to concurrency
+    lookups in flight on an event loop.
+
+    With hedge, a lookup whose search has run past the p95 of recent searches
+    is started a second time when the queue is empty and a worker is free, at
+    most hedge_budget hedges per lookup started. The first copy to succeed
+    settles the query. A hedge that hasn't started by then is dropped; one
+    that is already running can't be interrupted mid-page-load, so it
+    finishes within the page-load timeout and its result is discarded.
+    """
+
+    HEDGE_PRIORITY = (-0.5,)  # Ahead of all regular work, behind stop signals
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, backend=SEARCH_BACKEND, delay_range=DEFAULT_DELAY_RANGE,
+                 chunk_rows=STREAM_CHUNK_ROWS, chunks_in_flight=2, known_results=None, max_attempts=RETRY_MAX_ATTEMPTS,
+                 hedge=HEDGE_LOOKUPS, hedge_budget=HEDGE_BUDGET, engine=DEFAULT_ENGINE, concurrency=ASYNC_CONCURRENCY):
+        self.max_workers = max_workers
+        self.backend = backend
+        self.engine = engine
+        self.concurrency = concurrency
+        self.delay_range = delay_range
+        self.chunk_rows = chunk_rows
+        self.chunks_in_flight = chunks_in_flight
+        self.known_results = BoundedResults() if known_results is None else known_results
+        self.max_attempts = max_attempts
+        self.hedge = hedge
+        self.hedge_budget = hedge_budget
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.jobs = []
+        self._work = queue.PriorityQueue()
+        self._inflight = {}  # key -> (query, {copy: when its search started, None while it waits on rate limits})
+        self._hedged = set()
+        self._latencies = collections.deque(maxlen=HEDGE_WINDOW)
+        self._lookups = 0
+        self._threads = 0
+        self._lock = threading.Lock()
+        self._retries = []  # Heap of (ready_at, sequence, work item)
+        self._retrying = set()  # Keys waiting in the retry heap
+        self._attempts = collections.Counter()
+        self._failed = {}  # key -> (reason, attempts, last error)
+        self._done = queue.Queue()
+        self._waiters = collections.defaultdict(list)
+        self._sequence = itertools.count()
+        self._throttle = None
+        self._governor = None
+
+    @property
+    def throttle(self):
+        """The shared rate limiter for this scheduler's search host"""
+        if self._throttle is None:
+            self._throttle = get_token_bucket(search_host(self.backend))
+        return self._throttle
+
+    @property
+    def governor(self):
+        if self._governor is None:
+            self._governor = get_worker_governor(self.backend)
+        return self._governor
+
+    def describe(self):
+        if self.max_workers:
+            text = f"{self.throttle.describe()} · {self.max_workers} workers"
+        else:
+            text = f"{self.throttle.describe()} · {self.governor.describe()}"
+        if self.hedges:
+            text += f" · {self.hedges} hedged, {self.hedge_wins} won"
+        return text
+
+    def add_file(self, job):
+        self.jobs.append(job)
+        return job
+
+    def run(self, progress_callback=None, complete_callback=None):
+        """Process every file; callbacks receive the FileJob and run on the caller's thread"""
+        self._progress_callback = progress_callback
+        self._complete_callback = complete_callback
+
+        if self.engine == "async":
+            self._threads = self.concurrency
+            executor = ThreadPoolExecutor(max_workers=1)
+            futures = [executor.submit(asyncio.run, self._async_workers())]
+        else:
+            threads, gate = worker_plan(self.max_workers, self.backend)
+            self._threads = threads
+            executor = ThreadPoolExecutor(max_workers=threads)
+            futures = [executor.submit(self._worker, gate) for _ in range(threads)]
+        try:
+            while True:
+                self._fill()
+                self._flush()
+                if all(job.completed for job in self.jobs):
+                    break
+                self._release_retries()
+                self._issue_hedges()
+                try:
+                    item, result = self._done.get(timeout=0.2)
+                except queue.Empty:
+                    if all(f.done() for f in futures):
+                        for future in futures:
+                            if future.exception():
+                                raise future.exception()
+                        raise RuntimeError("All lookup workers stopped before the work queue was empty")
+                    continue
+                key = item[2][0]
+                if key not in self._waiters:
+                    continue  # The other copy of a hedged lookup already settled it
+                if isinstance(result, LookupFailure):
+                    with self._lock:
+                        twin_running = key in self._inflight
+                    # A hedged query is decided by its other copy if that is still running or already retrying
+                    if key not in self._hedged or not (twin_running or key in self._retrying):
+                        self._retry_or_fail(item, result)
+                else:
+                    if item[0] == self.HEDGE_PRIORITY:
+                        self.hedge_wins += 1
+                        get_metrics().inc("clutch_hedged_lookups_total", outcome="won")
+                    self._settle(key, result)
+        finally:
+            # Stop signals sort ahead of any remaining work
+            for _ in futures:
+                self._work.put(((-1,), next(self._sequence), None))
+            # Losing copies of hedged lookups finish on their own; don't hold the results back for them
+            with self._lock:
+                losers_running = bool(self._inflight)
+            executor.shutdown(wait=not losers_running)
+        return self.jobs
+
+    def _worker(self, gate):
+        cache = get_lookup_cache()
+        with get_resolver(self.backend) as resolver:
+            throttle = get_token_bucket(resolver.host)
+            while True:
+                item = self._work.get()
+                if item[2] is None:
+                    return
+                key, name, company = item[2]
+                # The governor is shared by every job, so only the lookup holds a slot, not the wait for work
+                with gate():
+                    if key not in self._waiters:
+                        get_metrics().inc("clutch_hedged_lookups_total", outcome="cancelled")
+                        continue  # A hedge whose original finished while it was queued
+                    copy, result = self._start_copy(key, item[2]), None
+                    try:
+                        result = process_row({'Reviewer Name': name, 'Reviewer Company': company}, resolver, throttle,
+                                             self.delay_range, cache, raise_failures=True,
+                                             on_search=functools.partial(self._search_started, key, copy))
+                    except LookupFailure as failure:
+                        result = failure
+                    except Exception:
+                        # Put the query back so another worker can pick it up
+                        self._work.put(item)
+                        raise
+                    finally:
+                        self._end_copy(key, copy, result)
+                self._done.put((item, result))
+
+    async def _async_workers(self):
+        """Hand queued lookups to up to concurrency coroutines on this thread's event loop until a stop signal arrives"""
+        cache = get_lookup_cache()
+        free = asyncio.Semaphore(self.concurrency)
+        running = set()
+        with get_resolver(self.backend) as resolver:
+            throttle = get_token_bucket(resolver.host)
+            while True:
+                await free.acquire()
+                # Waits in a helper thread instead of polling; work isn't taken before a coroutine is free for it,
+                # so it stays in priority order
+                item = await asyncio.to_thread(self._work.get)
+                for task in [task for task in running if task.done()]:
+                    running.discard(task)
+                    if task.exception():
+                        self._work.put(item)
+                        raise task.exception()
+                if item[2] is None:
+                    break
+                if item[2][0] not in self._waiters:
+                    get_metrics().inc("clutch_hedged_lookups_total", outcome="cancelled")
+                    free.release()
+                    continue
+                task = asyncio.create_task(self._lookup_async(item, resolver, throttle, cache))
+                task.add_done_callback(lambda _: free.release())
+                running.add(task)
+            await asyncio.gather(*running)
 
-def process_batch(df_batch, delay_range, progress_callback=None, batch_id=0):
-    """Process a batch of rows with a shared driver"""
-    driver = setup_driver()
-    results = []
+    async def _lookup_async(self, item, resolver, throttle, cache):
+        key, name, company = item[2]
+        copy, result = self._start_copy(key, item[2]), None
+        try:
+            result = await process_row_async({'Reviewer Name': name, 'Reviewer Company': company}, resolver, throttle,
+                                             self.delay_range, cache, raise_failures=True,
+                                             on_search=functools.partial(self._search_started, key, copy))
+        except LookupFailure as failure:
+            result = failure
+        except Exception:
+            # Put the query back; the dispatcher stops on the exception
+            self._work.put(item)
+            raise
+        finally:
+            self._end_copy(key, copy, result)
+        self._done.put((item, result))
+
+    def _start_copy(self, key, query):
+        copy = next(self._sequence)
+        with self._lock:
+            self._inflight.setdefault(key, (query, {}))[1][copy] = None
+            self._lookups += 1
+        return copy
+
+    def _search_started(self, key, copy):
+        # Latency is timed from here: waits on the governor and rate limiter aren't the search host being slow
+        with self._lock:
+            self._inflight[key][1][copy] = time.monotonic()
+
+    def _end_copy(self, key, copy, result):
+        with self._lock:
+            copies = self._inflight[key][1]
+            started = copies.pop(copy)
+            if not copies:
+                del self._inflight[key]
+            if started is not None and result is not None and not isinstance(result, LookupFailure):
+                self._latencies.append(time.monotonic() - started)
+
+    def _issue_hedges(self):
+        """Duplicate lookups running past the recent p95 while workers are free, within the hedge budget"""
+        if not self.hedge or len(self._latencies) < HEDGE_MIN_SAMPLES or not self._work.empty():
+            return
+        now = time.monotonic()
+        with self._lock:
+            latencies = sorted(self._latencies)
+            threshold = max(HEDGE_MIN_DELAY, latencies[int(0.95 * (len(latencies) - 1))])
+            free_workers = self._threads - sum(len(copies) for _, copies in self._inflight.values())
+            searching = ((min(filter(None, copies.values()), default=now), key, query)
+                         for key, (query, copies) in self._inflight.items() if key not in self._hedged)
+            slow = sorted(entry for entry in searching if now - entry[0] > threshold)
+            budget = int(self.hedge_budget * self._lookups) - self.hedges
+        if self.engine != "async" and not self.max_workers:
+            # Idle threads beyond the governor's current allowance couldn't run a hedge either
+            free_workers = min(free_workers, self.governor.free())
+        for _, key, query in slow[:max(0, min(free_workers, budget))]:
+            self._hedged.add(key)
+            self.hedges += 1
+            get_metrics().inc("clutch_hedged_lookups_total", outcome="started")
+            self._work.put((self.HEDGE_PRIORITY, next(self._sequence), query))
+
+    def _fill(self):
+        """Read chunks from every file until each has chunks_in_flight waiting"""
+        for order, job in enumerate(self.jobs):
+            while not job._exhausted and len(job._chunks) < self.chunks_in_flight:
+                if job._reader is None:
+                    job._reader = self._read_chunks(job)
+                try:
+                    frame = next(job._reader)
+                except StopIteration:
+                    job._exhausted = True
+                    job._reader.close()
+                    break
+                self._plan_chunk(job, order, frame)
+
+    def _read_chunks(self, job):
+        if job.frame is None:
+            return pd.read_csv(job.input_path, chunksize=self.chunk_rows)
+        return (job.frame.iloc[i:i + self.chunk_rows].copy() for i in range(0, len(job.frame), self.chunk_rows))
+
+    def _plan_chunk(self, job, order, frame):
+        (keys,), work = plan_queries([frame])
+        chunk = _Chunk(frame, keys)
+        row_counts = keys.value_counts()
+        settled_rows = len(frame) - int(row_counts.sum())  # Anonymous reviewers
+        resumed = job.checkpoint.lookup(work.index) if job.checkpoint else {}
+        priority = (job._chunk_count, job.total_rows, order)
+
+        for key, name, company in zip(work.index, work['Reviewer Name'], work['Reviewer Company']):
+            if key in resumed:
+                self.known_results[key] = resumed[key]
+            elif key in self.known_results and job.checkpoint:
+                job.checkpoint.record(key, self.known_results[key])
+            if key in self._failed:
+                chunk.results[key] = "Error"
+                job.failures[key] = self._failed[key]
+                settled_rows += int(row_counts[key])
+                continue
+            if key in self.known_results:
+                chunk.results[key] = self.known_results[key]
+                settled_rows += int(row_counts[key])
+                continue
+
+            chunk.waiting[key] = int(row_counts[key])
+            # Only the first waiter queues the lookup; later ones share its result
+            if key not in self._waiters:
+                self._work.put((priority, next(self._sequence), (key, name, company)))
+            self._waiters[key].append((job, chunk))
+
+        job._chunks.append(chunk)
+        job._chunk_count += 1
+        if settled_rows:
+            job.done_rows += settled_rows
+            if self._progress_callback:
+                self._progress_callback(job)
+
+    def _retry_or_fail(self, item, failure):
+        key = item[2][0]
+        self._attempts[key] += 1
+        attempts = self._attempts[key]
+        if failure.retryable and attempts < self.max_attempts:
+            heapq.heappush(self._retries, (time.monotonic() + retry_delay(attempts), next(self._sequence), item))
+            self._retrying.add(key)
+            return
+        self._failed[key] = (failure.reason, attempts, str(failure))
+        self._settle(key, "Error", self._failed[key])
+
+    def _release_retries(self):
+        """Move retries whose backoff has elapsed back into the work queue"""
+        now = time.monotonic()
+        while self._retries and self._retries[0][0] <= now:
+            item = heapq.heappop(self._retries)[2]
+            self._retrying.discard(item[2][0])
+            self._work.put(item)
+
+    def _settle(self, key, result, failure=None):
+        if failure is None:
+            self.known_results[key] = result
+        for job, chunk in self._waiters.pop(key, []):
+            chunk.results[key] = result
+            if failure is not None:
+                job.failures[key] = failure
+            job.done_rows += chunk.waiting.pop(key)
+            if job.checkpoint:
+                job.checkpoint.record(key, result)
+            if self._progress_callback:
+                self._progress_callback(job)
+
+    def _flush(self):
+        """Append fully resolved chunks to their outputs, in file order"""
+        for job in self.jobs:
+            while job._chunks and not job._chunks[0].waiting:
+                chunk = job._chunks.popleft()
+                first = job.written_rows == 0
+                if first:
+                    job.failed_path.unlink(missing_ok=True)
+                # Failed rows are reported as read, like write_failed_rows does, before the results column is set
+                if job.failures:
+                    job.failed_rows += append_failed_rows(job.failed_path, failed_rows(chunk.frame, chunk.keys, job.failures))
+                chunk.frame['LinkedIn Profile'] = fan_out_results(chunk.keys, chunk.results).values
+                chunk.frame.to_csv(job.output_path, mode="w" if first else "a", header=first, index=False)
+                job.written_rows += len(chunk.frame)
+
+            if job._exhausted and not job._chunks and not job.completed:
+                if job.written_rows == 0:
+                    frame = pd.read_csv(job.input_path, nrows=0) if job.frame is None else job.frame.iloc[0:0].copy()
+                    frame['LinkedIn Profile'] = []
+                    frame.to_csv(job.output_path, index=False)
+                job.completed = True
+                if self._complete_callback:
+                    self._complete_callback(job)
+
+class LeaseQueue:
+    """Base class for shared queues that hand out time-limited leases on lookup queries
+
+    Any number of worker processes, on any number of machines, lease queries,
+    look them up and complete them. A lease that isn't completed before it
+    expires (the worker died or hung) goes back to the queue for someone else.
+    """
+
+    def submit(self, job_id, name, tasks, total_rows, content=None):
+        """Add a job; tasks are (key, name, company, rows) tuples
+
+        job_id must be unique per submission. Queries another job with the same
+        content (an upload hash) has already resolved start out done.
+        """
+        raise NotImplementedError
+
+    def lease(self, worker_id, limit=JOB_LEASE_BATCH, lease_seconds=JOB_LEASE_SECONDS):
+        """Claim up to limit pending queries as (job_id, key, name, company) tuples"""
+        raise NotImplementedError
+
+    def complete(self, job_id, key, result):
+        """Store the result of a leased query"""
+        raise NotImplementedError
+
+    def fail(self, job_id, key, failure, max_attempts=RETRY_MAX_ATTEMPTS):
+        """Requeue a query after a LookupFailure with backoff, or settle it as "Error" once it can't be retried"""
+        raise NotImplementedError
+
+    def release(self, job_id, key):
+        """Give a leased query back without counting an attempt"""
+        raise NotImplementedError
+
+    def progress(self, job_id):
+        """Dict of total_rows, done_rows, pending, leased and done query counts for a job"""
+        raise NotImplementedError
+
+    def results(self, job_id):
+        """Resolved queries of a job, keyed like plan_queries"""
+        raise NotImplementedError
+
+    def failures(self, job_id):
+        """(reason, attempts, last error) of a job's queries that failed for good, keyed like plan_queries"""
+        raise NotImplementedError
+
+    def remove(self, job_id):
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the queue"""
+
+class SqliteLeaseQueue(LeaseQueue):
+    """LeaseQueue in a SQLite file; workers on other machines need it on a shared volume with working locks"""
+
+    def __init__(self, path=JOB_QUEUE_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, name TEXT NOT NULL, total_rows INTEGER NOT NULL, submitted_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "job_id TEXT NOT NULL, key TEXT NOT NULL, name TEXT NOT NULL, company TEXT NOT NULL, "
+            "rows INTEGER NOT NULL, state TEXT NOT NULL DEFAULT 'pending', owner TEXT, expires_at REAL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, result TEXT, PRIMARY KEY (job_id, key))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, expires_at)")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        if "reason" not in columns:
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN reason TEXT")
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN error TEXT")
+        if "content" not in {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN content TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_content ON jobs (content)")
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # IMMEDIATE takes the write lock up front so two workers never lease the same query
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def submit(self, job_id, name, tasks, total_rows, content=None):
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, name, total_rows, submitted_at, content) VALUES (?, ?, ?, ?, ?)",
+                (job_id, name, total_rows, time.time(), content),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks (job_id, key, name, company, rows) VALUES (?, ?, ?, ?, ?)",
+                ((job_id, key, task_name, company, rows) for key, task_name, company, rows in tasks),
+            )
+            if content is None:
+                return
+            resolved = conn.execute(
+                "SELECT key, result FROM tasks JOIN jobs ON jobs.job_id = tasks.job_id "
+                "WHERE jobs.content = ? AND jobs.job_id != ? AND state = 'done' AND result != 'Error'",
+                (content, job_id),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET state = 'done', result = ? WHERE job_id = ? AND key = ? AND state = 'pending'",
+                ((result, job_id, key) for key, result in resolved),
+            )
+
+    def lease(self, worker_id, limit=JOB_LEASE_BATCH, lease_seconds=JOB_LEASE_SECONDS):
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET state = 'pending', owner = NULL, expires_at = NULL "
+                "WHERE state = 'leased' AND expires_at < ?",
+                (now,),
+            )
+            # A pending task's expires_at is when its retry backoff ends
+            leased = conn.execute(
+                "SELECT tasks.rowid, tasks.job_id, key, tasks.name, company FROM tasks "
+                "JOIN jobs ON jobs.job_id = tasks.job_id "
+                "WHERE state = 'pending' AND (expires_at IS NULL OR expires_at <= ?) "
+                "ORDER BY jobs.submitted_at, tasks.rowid LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET state = 'leased', owner = ?, expires_at = ? WHERE rowid = ?",
+                ((worker_id, now + lease_seconds, rowid) for rowid, *_ in leased),
+            )
+        return [tuple(task) for _, *task in leased]
+
+    def complete(self, job_id, key, result):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET state = 'done', result = ?, owner = NULL, attempts = attempts + 1 "
+                "WHERE job_id = ? AND key = ?",
+                (result, job_id, key),
+            )
+
+    def fail(self, job_id, key, failure, max_attempts=RETRY_MAX_ATTEMPTS):
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts FROM tasks WHERE job_id = ? AND key = ? AND state != 'done'", (job_id, key)
+            ).fetchone()
+            if row is None:
+                return
+            attempts = row[0] + 1
+            if failure.retryable and attempts < max_attempts:
+                conn.execute(
+                    "UPDATE tasks SET state = 'pending', owner = NULL, expires_at = ?, attempts = ?, reason = ?, error = ? "
+                    "WHERE job_id = ? AND key = ?",
+                    (time.time() + retry_delay(attempts), attempts, failure.reason, str(failure), job_id, key),
+                )
+            else:
+                conn.execute(
+                    "UPDATE tasks SET state = 'done', result = 'Error', owner = NULL, attempts = ?, reason = ?, error = ? "
+                    "WHERE job_id = ? AND key = ?",
+                    (attempts, failure.reason, str(failure), job_id, key),
+                )
+
+    def release(self, job_id, key):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET state = 'pending', owner = NULL, expires_at = NULL "
+                "WHERE job_id = ? AND key = ? AND state = 'leased'",
+                (job_id, key),
+            )
+
+    def progress(self, job_id):
+        with self._lock:
+            job = self._conn.execute("SELECT total_rows FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            counts = dict(self._conn.execute(
+                "SELECT state, COUNT(*) FROM tasks WHERE job_id = ? GROUP BY state", (job_id,)
+            ).fetchall())
+            queued_rows = self._conn.execute(
+                "SELECT COALESCE(SUM(rows), 0), COALESCE(SUM(CASE WHEN state = 'done' THEN rows END), 0) "
+                "FROM tasks WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+        total_rows = job[0] if job else 0
+        return {
+            "total_rows": total_rows,
+            # Rows that never needed a lookup (anonymous reviewers) count as done from the start
+            "done_rows": total_rows - queued_rows[0] + queued_rows[1],
+            "pending": counts.get("pending", 0),
+            "leased": counts.get("leased", 0),
+            "done": counts.get("done", 0),
+        }
+
+    def results(self, job_id):
+        with self._lock:
+            return dict(self._conn.execute(
+                "SELECT key, result FROM tasks WHERE job_id = ? AND state = 'done'", (job_id,)
+            ).fetchall())
+
+    def failures(self, job_id):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, reason, attempts, error FROM tasks WHERE job_id = ? AND state = 'done' AND result = 'Error'",
+                (job_id,),
+            ).fetchall()
+        return {key: (reason, attempts, error) for key, reason, attempts, error in rows}
+
+    def remove(self, job_id):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM tasks WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+@st.cache_resource
+def get_job_queue():
+    """Process-wide handle on the shared job queue"""
+    job_queue = SqliteLeaseQueue()
+    atexit.register(job_queue.close)
+    return job_queue
+
+def run_queue_worker(job_queue, worker_id, max_workers=DEFAULT_MAX_WORKERS, backend=SEARCH_BACKEND,
+                     delay_range=DEFAULT_DELAY_RANGE, idle_timeout=None, stop_event=None):
+    """Lease and look up queries from a shared queue until stopped (or idle for idle_timeout seconds)
+
+    Returns the number of queries this process completed.
+    """
+    stop_event = stop_event or threading.Event()
+    completed = itertools.count()
+    cache = get_lookup_cache()
+    max_workers, gate = worker_plan(max_workers, backend)
+
+    def worker(thread_id):
+        lease_owner = f"{worker_id}/{thread_id}"
+        idle_since = time.monotonic()
+        with get_resolver(backend) as resolver:
+            throttle = get_token_bucket(resolver.host)
+            while not stop_event.is_set():
+                # Lease only once allowed to run, so leases don't expire in threads the governor holds back
+                with gate():
+                    tasks = job_queue.lease(lease_owner)
+                    for position, (job_id, key, name, company) in enumerate(tasks):
+                        if stop_event.is_set():
+                            for job_id, key, *_ in tasks[position:]:
+                                job_queue.release(job_id, key)
+                            return
+                        try:
+                            result = process_row({'Reviewer Name': name, 'Reviewer Company': company}, resolver,
+                                                 throttle, delay_range, cache, raise_failures=True)
+                        except LookupFailure as failure:
+                            job_queue.fail(job_id, key, failure)
+                            next(completed)
+                            continue
+                        except Exception:
+                            # Hand the rest of the batch back for another worker
+                            for job_id, key, *_ in tasks[position:]:
+                                job_queue.release(job_id, key)
+                            raise
+                        job_queue.complete(job_id, key, result)
+                        next(completed)
+                if tasks:
+                    idle_since = time.monotonic()
+                    continue
+                # Poll outside the gate, so an idle thread doesn't keep a slot from busy ones
+                if idle_timeout is not None and time.monotonic() - idle_since > idle_timeout:
+                    return
+                stop_event.wait(JOB_POLL_SECONDS)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(worker, thread_id) for thread_id in range(max_workers)]
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            stop_event.set()
+    return next(completed)
+
+class QueueSubmitter:
+    """Submit files to a shared job queue and follow them while remote workers do the lookups
+
+    Offers the same add_file/run interface as LookupScheduler.
+    """
+
+    def __init__(self, job_queue=None, chunk_rows=STREAM_CHUNK_ROWS, poll_seconds=JOB_POLL_SECONDS):
+        self.job_queue = job_queue or get_job_queue()
+        self.chunk_rows = chunk_rows
+        self.poll_seconds = poll_seconds
+        self.jobs = []
+        self._job_ids = {}
+        self._counts = {}
+
+    def add_file(self, job):
+        """Queue the unique queries of a file; results already found for the same content are reused"""
+        with open(job.input_path, "rb") as f:
+            content = upload_checkpoint_id(f)
+        # Identical uploads still get jobs of their own, so finishing one never removes another's tasks
+        job_id = f"{content}-{uuid.uuid4().hex}"
+        rows = collections.Counter()
+        names = {}
+        for frame in pd.read_csv(job.input_path, chunksize=self.chunk_rows):
+            (keys,), work = plan_queries([frame])
+            rows.update(keys.dropna())
+            for key, name, company in zip(work.index, work['Reviewer Name'], work['Reviewer Company']):
+                names.setdefault(key, (name, company))
+        tasks = ((key, name, company, rows[key]) for key, (name, company) in names.items())
+        self.job_queue.submit(job_id, job.name, tasks, job.total_rows, content)
+        self._job_ids[job] = job_id
+        self.jobs.append(job)
+        return job
+
+    def describe(self):
+        pending = sum(counts["pending"] for counts in self._counts.values())
+        leased = sum(counts["leased"] for counts in self._counts.values())
+        return f"{pending} queries queued, {leased} being searched by workers"
+
+    def run(self, progress_callback=None, complete_callback=None):
+        """Poll the queue until every file is resolved, then write each output"""
+        while not all(job.completed for job in self.jobs):
+            for job in self.jobs:
+                if job.completed:
+                    continue
+                counts = self._counts[job] = self.job_queue.progress(self._job_ids[job])
+                if counts["done_rows"] != job.done_rows:
+                    job.done_rows = counts["done_rows"]
+                    if progress_callback:
+                        progress_callback(job)
+                if counts["pending"] or counts["leased"]:
+                    continue
+
+                job_id = self._job_ids[job]
+                job.written_rows = write_processed_csv(job.input_path, job.output_path, self.job_queue.results(job_id),
+                                                       self.chunk_rows)
+                job.failures = self.job_queue.failures(job_id)
+                job.failed_rows = write_failed_rows(job.input_path, job.failed_path, job.failures, self.chunk_rows)
+                self.job_queue.remove(job_id)
+                job.completed = True
+                if complete_callback:
+                    complete_callback(job)
+            if not all(job.completed for job in self.jobs):
+                time.sleep(self.poll_seconds)
+        return self.jobs
+
+class ProcessingJob:
+    """One batch of uploaded files processed in the background; the UI polls its state"""
+
+    def __init__(self, job_id, uploads, artifact_dir, formats=()):
+        self.job_id = job_id
+        self.uploads = uploads  # (file name, temp path, output path) per validated upload
+        self.artifact_dir = artifact_dir  # Every output of this job, written once; unguessable when served statically
+        self.formats = list(formats)  # Extra output formats besides CSV
+        self.files = []  # FileJob per upload once the job has started
+        self.resumed = {}  # File name -> results restored from a checkpoint
+        self.status = "queued"
+        self.error = None
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self.processed_files = []
+        self.failed_files = []  # Reports of rows that still failed after every retry
+        self.exported_files = []  # Processed files in the extra formats
+        self.zip_path = None
+        self.published = {}  # File name -> locations in the configured sinks
+        self.publish_errors = {}
+        self.scheduler_status = ""
+        self.cache_stats = None
+        self.pool_stats = None
+        self.metrics_before = None
+        self.metrics_after = None
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def progress(self):
+        total = sum(file_job.total_rows for file_job in self.files)
+        if not total:
+            return 1.0 if self.finished else 0.0
+        return sum(file_job.done_rows for file_job in self.files) / total
+
+def run_processing_job(job, distributed=DISTRIBUTED_MODE):
+    """Look up every file of a job through one scheduler; runs on the job executor"""
+    lookup_cache = get_lookup_cache()
+    cache_baseline = lookup_cache.stats()
+    metrics = get_metrics()
+    job.metrics_before = metrics.snapshot()
+    job.status = "running"
+    status = "failed"
+    held = []  # Checkpoints of files that haven't finished yet
     try:
-        for i, (_, row) in enumerate(df_batch.iterrows()):
-            results.append(process_row(row, driver))
-            if progress_callback:
-                progress_callback(batch_id, i + 1, len(df_batch))
-            time.sleep(random.uniform(*delay_range))
+        scheduler = QueueSubmitter() if distributed else LookupScheduler()
+        for name, tmp_path, output_path in job.uploads:
+            # Resume from an earlier, interrupted run of the same upload
+            with open(tmp_path, "rb") as f:
+                checkpoint = open_checkpoint(upload_checkpoint_id(f))
+            held.append(checkpoint)
+            if checkpoint.exists():
+                job.resumed[name] = checkpoint.count()
+            job.files.append(scheduler.add_file(FileJob(name, tmp_path, output_path, checkpoint=checkpoint)))
+
+        status_updated = 0.0
+
+        def update_progress(file_job):
+            # Only cheap bookkeeping here; the page reads the FileJobs and the status at its own refresh rate
+            nonlocal status_updated
+            if time.monotonic() - status_updated >= PROGRESS_REFRESH_SECONDS:
+                status_updated = time.monotonic()
+                job.scheduler_status = scheduler.describe()
+
+        def complete_file(file_job):
+            job.processed_files.append(file_job.output_path)
+            if file_job.failed_rows:
+                job.failed_files.append(file_job.failed_path)
+            held.remove(file_job.checkpoint)
+            release_checkpoint(file_job.checkpoint)
+
+        scheduler.run(update_progress, complete_file)
+
+        for output_format in job.formats:
+            job.exported_files.extend(export_table(path, output_format) for path in job.processed_files)
+        if len(job.processed_files) > 1:
+            job.zip_path = write_zip(job.processed_files + job.exported_files,
+                                     job.artifact_dir / "processed_linkedin_files.zip")
+        artifacts = job.processed_files + job.exported_files + job.failed_files + [job.zip_path] * bool(job.zip_path)
+        job.published, job.publish_errors = publish_artifacts(artifacts, [artifact_sink(s) for s in ARTIFACT_SINKS],
+                                                              job.artifact_dir.name)
+        status = "done"
+    except Exception as e:
+        job.error = str(e)
+        status = "failed"
     finally:
-        driver.quit()
-    return results
-
-def process_single_file(df, filename, ui_progress_callback=None):
-    """Process a single dataframe with real-time progress updates"""
-    if 'LinkedIn Profile' not in df.columns:
-        df['LinkedIn Profile'] = ''
-
-    # Split dataframe into batches
-    batch_size = max(5, len(df) // DEFAULT_MAX_WORKERS)
-    batches = [df.iloc[i:i + batch_size] for i in range(0, len(df), batch_size)]
-    
-    total_rows = len(df)
-    processed_rows = 0
-    
-    # Create a shared progress tracking function
-    def batch_progress_callback(batch_id, batch_processed, batch_total):
-        nonlocal processed_rows
-        # Calculate total processed rows across all batches
-        current_total = sum(len(batches[i]) for i in range(batch_id)) + batch_processed
-        if ui_progress_callback:
-            ui_progress_callback(current_total, total_rows)
-    
-    # Process batches sequentially for better progress tracking
-    all_results = []
-    for i, batch in enumerate(batches):
-        if ui_progress_callback:
-            ui_progress_callback(processed_rows, total_rows)
-        
-        batch_results = process_batch(batch, DEFAULT_DELAY_RANGE, batch_progress_callback, i)
-        all_results.extend(batch_results)
-        processed_rows += len(batch_results)
-    
-    # Update dataframe with results
-    df['LinkedIn Profile'] = all_results[:len(df)]
-    return df
+        for checkpoint in held:
+            release_checkpoint(checkpoint, finished=False)
+        for _, tmp_path, _ in job.uploads:
+            Path(tmp_path).unlink(missing_ok=True)
+        cache_stats = lookup_cache.stats()
+        job.cache_stats = {
+            "hits": cache_stats["hits"] - cache_baseline["hits"],
+            "misses": cache_stats["misses"] - cache_baseline["misses"],
+            "entries": cache_stats["entries"],
+        }
+        job.pool_stats = get_driver_pool().stats()
+        job.metrics_after = metrics.snapshot()
+        job.finished_at = time.time()
+        # Set last: the page treats a finished job's stats as complete
+        job.status = status
+
+class JobRegistry:
+    """Background executor and registry of processing jobs that outlive reruns and page reloads"""
+
+    def __init__(self, max_workers=JOB_EXECUTOR_WORKERS, history=JOB_HISTORY):
+        self.history = history
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="clutch-job")
+        self._jobs = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, uploads, formats=()):
+        """Start processing (file name, temp path) uploads; returns the ProcessingJob"""
+        job_id = uuid.uuid4().hex[:8]
+        artifact_dir = ARTIFACT_DIR / uuid.uuid4().hex
+        artifact_dir.mkdir(parents=True)
+        with self._lock:
+            outputs = [(name, path, self._reserve_output(artifact_dir, name)) for name, path in uploads]
+            job = ProcessingJob(job_id, outputs, artifact_dir, formats)
+            self._jobs[job_id] = job
+            finished = [old_id for old_id, old in self._jobs.items() if old.finished]
+            for old_id in finished[:max(0, len(self._jobs) - self.history)]:
+                del self._jobs[old_id]
+        self._executor.submit(run_processing_job, job)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _reserve_output(self, artifact_dir, name):
+        # Claim the path now so same-named uploads in one job never share an output
+        output_path = artifact_dir / f"processed_{name}"
+        for copy in itertools.count(2):
+            if not output_path.exists():
+                break
+            output_path = artifact_dir / f"processed_{Path(name).stem}_{copy}{Path(name).suffix}"
+        output_path.touch()
+        return output_path
+
+@st.cache_resource
+def get_job_registry():
+    """Process-wide job registry shared by every browser session"""
+    registry = JobRegistry()
+    atexit.register(registry.shutdown)
+    return registry
+
+def file_card_html(name, detail, state):
+    """Status card for one file in state "queued", "processing" or "completed"."""
+    card_class, badge_class, badge, detail_alpha = {
+        "queued": ("processing-file", "status-pending", "Queued", 0.8),
+        "processing": ("processing-file", "status-processing animate-pulse", "Processing...", 0.8),
+        "completed": ("completed-file", "status-completed", "Completed", 0.9),
+    }[state]
+    return f"""
+    <div class="processing-card {card_class}">
+        <div style="display: flex; justify-content: space-between; align-items: center;">
+            <div>
+                <strong>📄 {name}</strong>
+                <div style="color: rgba(255,255,255,{detail_alpha}); font-size: 0.875rem;">{detail}</div>
+            </div>
+            <span class="status-badge {badge_class}">{badge}</span>
+        </div>
+    </div>
+    """
+
+def render_running_job(job):
+    """Progress of a job that is still running"""
+    if job.status == "queued":
+        st.markdown(f"**Job {job.job_id}: waiting for a free slot...**")
+    elif DISTRIBUTED_MODE:
+        st.markdown(f"**Job {job.job_id}: {len(job.uploads)} files queued for the lookup workers...**")
+    else:
+        st.markdown(f"**Job {job.job_id}: processing {len(job.uploads)} files with a shared worker pool...**")
+    st.progress(job.progress())
+
+    for name, count in job.resumed.items():
+        st.info(f"♻️ Resuming '{name}' with {count} results from a previous run")
+    for file_job in list(job.files):
+        processed, total = file_job.done_rows, file_job.total_rows
+        progress = processed / total if total else 1.0
+        if file_job.completed:
+            st.markdown(file_card_html(file_job.name, f"✅ {file_job.written_rows} rows processed", "completed"),
+                        unsafe_allow_html=True)
+        elif processed:
+            st.markdown(file_card_html(file_job.name, f"Processing {processed}/{total} rows ({progress:.1%})", "processing"),
+                        unsafe_allow_html=True)
+        else:
+            st.markdown(file_card_html(file_job.name, f"{total} rows to process", "queued"), unsafe_allow_html=True)
+    if job.scheduler_status:
+        st.caption(f"🔍 Searching LinkedIn profiles... {job.scheduler_status}")
+
+@st.fragment(run_every=PROGRESS_REFRESH_SECONDS)
+def running_jobs_panel(job_ids):
+    """Redraw running jobs at a fixed rate, independent of how fast rows complete"""
+    registry = get_job_registry()
+    jobs = [job for job in map(registry.get, job_ids) if job]
+    for job in jobs:
+        render_running_job(job)
+    if any(job.finished for job in jobs):
+        st.rerun()  # Full rerun moves finished jobs to the static results section
+
+def render_download(path, label, key):
+    """Link to a file Streamlit streams from disk, or a download button where static serving can't reach it"""
+    path = Path(path)
+    url = static_url(path)
+    if url:
+        st.markdown(f'<a class="download-link" href="{html.escape(url)}" download="{html.escape(path.name)}">'
+                    f'{html.escape(label)}</a>', unsafe_allow_html=True)
+        return
+    with open(path, 'rb') as f:
+        st.download_button(label=label, data=f, file_name=path.name,
+                           mime=CONTENT_TYPES.get(path.suffix, "application/octet-stream"), key=key)
+
+def render_finished_job(job):
+    """Results, downloads and stats of a finished job"""
+    for file_job in job.files:
+        st.markdown(file_card_html(file_job.name, f"✅ {file_job.written_rows} rows processed", "completed"),
+                    unsafe_allow_html=True)
+    if job.status == "failed":
+        st.error(f"❌ An error occurred: {job.error}")
+    else:
+        st.markdown("✅ **All files processed successfully!**")
+
+    if job.processed_files:
+        st.markdown("---")
+        st.markdown("### 📥 Download Processed Files")
+
+        # Downloads serve the saved outputs
+        for file_path in job.processed_files + job.exported_files:
+            render_download(file_path, f"📄 Download {file_path.name}", f"download-{job.job_id}-{file_path.name}")
+
+        if job.zip_path:
+            render_download(job.zip_path, "📦 Download All Files (ZIP)", f"download-{job.job_id}-zip")
+
+        st.success(f"🎉 Successfully processed {len(job.processed_files)} files!")
+        st.info(f"📁 Files also saved to: {job.artifact_dir}")
+        for name, locations in job.published.items():
+            st.caption(f"☁️ {name} → {', '.join(locations)}")
+        for name, error in job.publish_errors.items():
+            st.warning(f"⚠️ Could not publish {name}: {error}")
+
+    if job.failed_files:
+        failed_total = sum(file_job.failed_rows for file_job in job.files)
+        st.warning(f"⚠️ {failed_total} rows could not be looked up after {RETRY_MAX_ATTEMPTS} attempts; "
+                   "they are marked \"Error\" in the output and listed with the reason below")
+        for file_path in job.failed_files:
+            render_download(file_path, f"⚠️ Download {file_path.name}", f"download-{job.job_id}-{file_path.name}")
+
+    cache_stats, pool_stats = job.cache_stats, job.pool_stats
+    st.caption(
+        f"🗄️ Lookup cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['entries']} entries"
+    )
+    st.caption(
+        f"🧰 Driver pool: {pool_stats['created']} started, {pool_stats['checkouts']} checkouts, "
+        f"{pool_stats['returns']} returns, {pool_stats['recycled']} recycled, {pool_stats['crashed']} crashed, "
+        f"{pool_stats['oversized']} over the memory limit, {pool_stats['checkout_wait_seconds']:.1f}s waiting"
+    )
+
+    # Where the lookup time went, for tuning workers, rate and browser settings
+    phases, outcomes = summarize_metrics(job.metrics_before, job.metrics_after)
+    with st.expander("📊 Lookup timing and outcomes"):
+        if phases.empty and outcomes.empty:
+            st.caption("No lookups ran in this process (all results came from the job queue or a checkpoint).")
+        else:
+            st.markdown("**Time per phase** (driver_checkout includes driver_start; jobs running at the same time are included)")
+            st.dataframe(phases, hide_index=True, use_container_width=True)
+            st.markdown("**Outcomes**")
+            st.dataframe(outcomes, hide_index=True, use_container_width=True)
 
 # Streamlit UI
 def main():
@@ -146,6 +3378,9 @@ def main():
         page_icon="🔍",
         layout="centered"
     )
+    # Start a browser while the user picks files, so the first lookup doesn't wait for Chrome
+    if not DISTRIBUTED_MODE:
+        start_prewarm()
 
     # Enhanced CSS to remove white blocks and improve design
     st.markdown("""
@@ -265,6 +3500,19 @@ def main():
         transform: translateY(-1px) !important;
         box-shadow: 0 4px 12px rgba(76, 175, 80, 0.4) !important;
     }
+
+    /* Streamed downloads look like download buttons */
+    a.download-link {
+        display: inline-block;
+        background: linear-gradient(45deg, #4CAF50, #45a049);
+        color: white !important;
+        text-decoration: none !important;
+        border-radius: 20px;
+        padding: 0.5rem 1.5rem;
+        margin: 0.25rem;
+        font-weight: 500;
+        box-shadow: 0 3px 10px rgba(76, 175, 80, 0.3);
+    }
     
     /* Main header styling */
     .main-header {
@@ -440,169 +3688,60 @@ def main():
         st.error("❌ Maximum 10 files allowed. Please select fewer files.")
         return
 
+    registry = get_job_registry()
+    # Jobs started from this browser live in the URL, so they survive page reloads
+    job_ids = [job_id for job_id in st.query_params.get("jobs", "").split(",") if registry.get(job_id)]
+
+    formats = []
+    if export_formats_available():
+        formats = st.multiselect("Also export as", export_formats_available(),
+                                 default=[f for f in OUTPUT_FORMATS if f in EXPORT_EXTENSIONS])
+
     # Process files if uploaded
     if uploaded_files and st.button("🚀 Start Processing", type="primary", use_container_width=True):
         if len(uploaded_files) == 0:
             st.warning("Please upload at least one CSV file.")
             return
-        
-        # Initialize session state for tracking
-        if 'processing_status' not in st.session_state:
-            st.session_state.processing_status = {}
-        
-        total_files = len(uploaded_files)
-        processed_files = []
-        
-        # Overall progress
-        overall_progress = st.progress(0)
-        overall_status = st.empty()
-        
-        # File status container
-        status_container = st.container()
-        
-        try:
-            for file_idx, uploaded_file in enumerate(uploaded_files):
-                # Update overall status
-                overall_status.markdown(f"**Processing file {file_idx + 1} of {total_files}: {uploaded_file.name}**")
-                
-                # Create temporary file
-                with tempfile.NamedTemporaryFile(mode='wb', suffix='.csv', delete=False) as tmp_file:
-                    tmp_file.write(uploaded_file.getvalue())
-                    tmp_file_path = tmp_file.name
-                
-                try:
-                    # Read the CSV
-                    df = pd.read_csv(tmp_file_path)
-                    
-                    # Validate required columns
-                    required_columns = ['Reviewer Name', 'Reviewer Company']
-                    if not all(col in df.columns for col in required_columns):
-                        st.error(f"❌ File '{uploaded_file.name}' missing required columns: {required_columns}")
-                        continue
-                    
-                    # Show file processing status with immediate feedback
-                    with status_container:
-                        processing_placeholder = st.empty()
-                        processing_placeholder.markdown(f"""
-                        <div class="processing-card processing-file">
-                            <div style="display: flex; justify-content: space-between; align-items: center;">
-                                <div>
-                                    <strong>📄 {uploaded_file.name}</strong>
-                                    <div style="color: rgba(255,255,255,0.8); font-size: 0.875rem;">{len(df)} rows to process</div>
-                                </div>
-                                <span class="status-badge status-processing animate-pulse">Starting...</span>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    # Progress tracking for current file
-                    file_progress = st.progress(0)
-                    file_status = st.empty()
-                    
-                    # Show immediate start status
-                    file_status.text("🚀 Initializing processing...")
-                    time.sleep(0.5)  # Brief pause to show status
-                    
-                    def update_progress(processed, total):
-                        progress = processed / total
-                        file_progress.progress(progress)
-                        
-                        # Update processing card status
-                        processing_placeholder.markdown(f"""
-                        <div class="processing-card processing-file">
-                            <div style="display: flex; justify-content: space-between; align-items: center;">
-                                <div>
-                                    <strong>📄 {uploaded_file.name}</strong>
-                                    <div style="color: rgba(255,255,255,0.8); font-size: 0.875rem;">Processing {processed}/{total} rows ({progress:.1%})</div>
-                                </div>
-                                <span class="status-badge status-processing animate-pulse">Processing...</span>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        file_status.text(f"🔍 Searching LinkedIn profiles... {processed}/{total} rows ({progress:.1%})")
-                    
-                    # Process the file
-                    processed_df = process_single_file(df, uploaded_file.name, update_progress)
-                    
-                    # Clean up progress indicators
-                    file_progress.empty()
-                    file_status.empty()
-                    
-                    # Update status to completed
-                    processing_placeholder.markdown(f"""
-                    <div class="processing-card completed-file">
-                        <div style="display: flex; justify-content: space-between; align-items: center;">
-                            <div>
-                                <strong>📄 {uploaded_file.name}</strong>
-                                <div style="color: rgba(255,255,255,0.9); font-size: 0.875rem;">✅ {len(processed_df)} rows processed</div>
-                            </div>
-                            <span class="status-badge status-completed">Completed</span>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Save processed file
-                    output_filename = f"processed_{uploaded_file.name}"
-                    output_path = CLUTCH_DATA_DIR / output_filename
-                    
-                    # Add timestamp if file exists
-                    if output_path.exists():
-                        timestamp = time.strftime("%Y%m%d_%H%M%S")
-                        output_filename = f"processed_{timestamp}_{uploaded_file.name}"
-                        output_path = CLUTCH_DATA_DIR / output_filename
-                    
-                    processed_df.to_csv(output_path, index=False)
-                    processed_files.append((output_path, processed_df))
-                    
-                finally:
-                    # Clean up temporary file
-                    os.unlink(tmp_file_path)
-                
-                # Update overall progress
-                overall_progress.progress((file_idx + 1) / total_files)
-            
-            # Final status
-            overall_status.markdown("✅ **All files processed successfully!**")
-            
-            # Download section
-            if processed_files:
-                st.markdown("---")
-                st.markdown("### 📥 Download Processed Files")
-                
-                # Create download buttons for individual files
-                for file_path, df in processed_files:
-                    csv_data = df.to_csv(index=False)
-                    st.download_button(
-                        label=f"📄 Download {file_path.name}",
-                        data=csv_data,
-                        file_name=file_path.name,
-                        mime='text/csv'
-                    )
-                
-                # Create zip download for all files
-                if len(processed_files) > 1:
-                    zip_buffer = io.BytesIO()
-                    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                        for file_path, df in processed_files:
-                            csv_data = df.to_csv(index=False)
-                            zip_file.writestr(file_path.name, csv_data)
-                    
-                    st.download_button(
-                        label="📦 Download All Files (ZIP)",
-                        data=zip_buffer.getvalue(),
-                        file_name="processed_linkedin_files.zip",
-                        mime='application/zip'
-                    )
-                
-                st.success(f"🎉 Successfully processed {len(processed_files)} files!")
-                st.info(f"📁 Files also saved to: {CLUTCH_DATA_DIR}")
-        
-        except Exception as e:
-            st.error(f"❌ An error occurred: {str(e)}")
-    
+
+        uploads = []
+        for uploaded_file in uploaded_files:
+            # Copy the upload to disk so the background job can read it in chunks after this run ends
+            with tempfile.NamedTemporaryFile(mode='wb', suffix='.csv', delete=False) as tmp_file:
+                uploaded_file.seek(0)
+                shutil.copyfileobj(uploaded_file, tmp_file)
+                tmp_file_path = tmp_file.name
+
+            # Validate required columns from the header alone
+            try:
+                columns = pd.read_csv(tmp_file_path, nrows=0).columns
+            except Exception as e:
+                # Empty, binary or garbled uploads
+                st.error(f"❌ File '{uploaded_file.name}' could not be read as CSV: {str(e)}")
+                os.unlink(tmp_file_path)
+                continue
+            required_columns = ['Reviewer Name', 'Reviewer Company']
+            if not all(col in columns for col in required_columns):
+                st.error(f"❌ File '{uploaded_file.name}' missing required columns: {required_columns}")
+                os.unlink(tmp_file_path)
+                continue
+            uploads.append((uploaded_file.name, tmp_file_path))
+
+        if uploads:
+            job = registry.submit(uploads, formats)
+            job_ids.append(job.job_id)
+            st.query_params["jobs"] = ",".join(job_ids)
+
+    jobs = [registry.get(job_id) for job_id in job_ids]
+    running = [job.job_id for job in jobs if not job.finished]
+    if running:
+        running_jobs_panel(running)
+    for job in reversed([job for job in jobs if job.finished]):
+        with st.container(border=True):
+            st.markdown(f"#### Job {job.job_id} · {time.strftime('%H:%M:%S', time.localtime(job.submitted_at))}")
+            render_finished_job(job)
+
     # Instructions
-    if not uploaded_files:
+    if not uploaded_files and not jobs:
         st.markdown("---")
         st.markdown("### 📋 Instructions")
         st.markdown("""
@@ -0,0 +1,398 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pandas as pd
+
+import app
+
+# Reviewers used when no CSV is given
+SAMPLE_QUERIES = [
+    ("Satya Nadella", "Microsoft"),
+    ("Sundar Pichai", "Google"),
+    ("Jane Doe", "Acme Consulting"),
+    ("John Smith", "Northwind Traders"),
+    ("Maria Garcia", "Contoso Ltd"),
+]
+
+def load_queries(path, limit):
+    """Sample (name, company) pairs from a Clutch export, or fall back to SAMPLE_QUERIES"""
+    if not path:
+        return SAMPLE_QUERIES[:limit]
+    df = pd.read_csv(path, nrows=limit * 5)
+    _, work = app.plan_queries([df])
+    return list(zip(work['Reviewer Name'], work['Reviewer Company']))[:limit]
+
+def summarize(samples):
+    """Median and mean of the per-lookup measurements"""
+    return {
+        "lookups": len(samples),
+        "median_seconds": statistics.median(s["seconds"] for s in samples),
+        "mean_seconds": statistics.mean(s["seconds"] for s in samples),
+        "median_bytes": statistics.median(s["bytes"] for s in samples),
+        "mean_bytes": statistics.mean(s["bytes"] for s in samples),
+        "mean_requests": statistics.mean(s["requests"] for s in samples),
+        "mean_blocked_requests": statistics.mean(s["blocked"] for s in samples),
+        "outcomes": {o: sum(s["outcome"] == o for s in samples) for o in {s["outcome"] for s in samples}},
+    }
+
+def run_lean_comparison(queries, repeats=1):
+    """Measure the same lookups with the standard and the lean browser profile"""
+    report = {}
+    for label, lean in (("standard", False), ("lean", True)):
+        started = time.perf_counter()
+        driver = app.setup_driver(lean=lean, measure=True)
+        startup_seconds = time.perf_counter() - started
+        try:
+            samples = [
+                app.measure_lookup(driver, app.build_query(name, company))
+                for _ in range(repeats)
+                for name, company in queries
+            ]
+        finally:
+            driver.quit()
+        report[label] = dict(summarize(samples), startup_seconds=startup_seconds)
+    return report
+
+def print_lean_report(report):
+    standard, lean = report["standard"], report["lean"]
+    print(f"{'':<22}{'standard':>14}{'lean':>14}{'change':>10}")
+    for field, unit in (("median_bytes", "B"), ("median_seconds", "s"), ("mean_requests", ""), ("startup_seconds", "s")):
+        before, after = standard[field], lean[field]
+        change = f"{(after - before) / before:+.0%}" if before else "n/a"
+        print(f"{field:<22}{before:>13.2f}{unit:1}{after:>13.2f}{unit:1}{change:>10}")
+
+class FakeSearchServer:
+    """Local stand-in for DuckDuckGo's HTML endpoint with configurable latency, misses, errors and rate limiting"""
+
+    def __init__(self, latency=0.2, miss_rate=0.2, error_rate=0.01, seed=None, block_rate=0.0):
+        self.latency = latency
+        self.miss_rate = miss_rate
+        self.error_rate = error_rate
+        self.block_rate = block_rate  # Share of requests answered with HTTP 429
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}/html/"
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _draw(self):
+        # One random draw per request under the lock keeps seeded runs reproducible
+        with self._lock:
+            self.requests += 1
+            return self._random.uniform(0.5, 1.5) * self.latency, self._random.random()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                delay, roll = server._draw()
+                time.sleep(delay)
+                query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query).get("q", [""])[0]
+                if roll < server.error_rate:
+                    status, body = 500, "<html><body>Internal Server Error</body></html>"
+                elif roll < server.error_rate + server.block_rate:
+                    status, body = 429, "<html><body>Too Many Requests</body></html>"
+                elif roll < server.error_rate + server.block_rate + server.miss_rate:
+                    status, body = 200, '<html><body><div class="no-results">No results.</div></body></html>'
+                else:
+                    status, body = 200, results_page(query)
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+def results_page(query):
+    """Canned results page in the layout of html.duckduckgo.com"""
+    slug = "-".join(query.split()[:2]).lower().strip('"') or "someone"
+    links = [
+        (f"https://www.linkedin.com/in/{urllib.parse.quote(slug)}", f"{query} - LinkedIn"),
+        ("https://clutch.co/profile/example", "Example | Clutch.co"),
+        ("https://example.com/team", "Our team"),
+    ]
+    results = "".join(
+        '<div class="result results_links"><h2 class="result__title">'
+        f'<a rel="nofollow" class="result__a" href="//duckduckgo.com/l/?uddg={urllib.parse.quote(href, safe="")}&amp;rut=x">'
+        f'{title}</a></h2><a class="result__snippet" href="#">Snippet for {title}</a></div>'
+        for href, title in links
+    )
+    return f"<html><body><div class=\"results\">{results}</div></body></html>"
+
+class ScriptedDriver:
+    """Just enough of a Selenium WebDriver for SeleniumResolver, served by plain HTTP requests
+
+    Exercises the resolver, pool and wait logic without Chrome; startup_seconds
+    stands in for the browser launch.
+    """
+
+    def __init__(self, startup_seconds=0.0):
+        time.sleep(startup_seconds)
+        self.current_url = "about:blank"
+        self.page_source = "<html></html>"
+
+    def get(self, url):
+        self.current_url = url
+        try:
+            with urllib.request.urlopen(url, timeout=app.HTTP_TIMEOUT) as response:
+                self.page_source = response.read().decode("utf-8", "replace")
+        except urllib.error.HTTPError as e:
+            # A browser renders the error page instead of raising
+            self.page_source = e.read().decode("utf-8", "replace")
+
+    def find_elements(self, by, selector):
+        rendered = 'class="result' in self.page_source or 'class="no-results' in self.page_source
+        return [self.page_source] if rendered else []
+
+    def execute_script(self, script, *args):
+        return app.HttpResolver.parse_candidates(self.page_source)
+
+    def quit(self):
+        pass
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+def run_throughput(backend, workers, rows, search_url, rate=None, driver_startup=0.0, real_browser=False):
+    """Look up rows synthetic reviewers with process_row on workers threads; runs in a fresh process"""
+    startups = []
+    pool = None
+    if backend == "selenium":
+        def factory():
+            started = time.perf_counter()
+            driver = app.setup_driver() if real_browser else ScriptedDriver(driver_startup)
+            startups.append(time.perf_counter() - started)
+            return driver
+
+        pool = app.DriverPool(size=workers, factory=factory)
+        app.SEARCH_RESULTS_URL = search_url
+        make_resolver = lambda: app.SeleniumResolver(pool=pool, navigation="direct")
+    else:
+        make_resolver = lambda: app.HttpResolver(search_url=search_url)
+
+    throttle = None
+    if rate:
+        throttle = app.TokenBucket(rate=rate, jitter=(0, 0))
+
+    work = [{'Reviewer Name': f"Bench Person{i}", 'Reviewer Company': "Example Co"} for i in range(rows)]
+    positions = iter(range(rows))
+    positions_lock = threading.Lock()
+    latencies = []
+    results = []
+
+    def worker():
+        with make_resolver() as resolver:
+            while True:
+                with positions_lock:
+                    position = next(positions, None)
+                if position is None:
+                    return
+                started = time.perf_counter()
+                result = app.process_row(work[position], resolver, throttle)
+                latencies.append(time.perf_counter() - started)
+                results.append(result)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(worker) for _ in range(workers)]:
+            future.result()
+    elapsed = time.perf_counter() - started
+    if pool:
+        pool.close()
+
+    outcomes = {"found": 0, "not_found": 0, "error": 0}
+    for result in results:
+        outcomes["not_found" if result == "Not Found" else "error" if result == "Error" else "found"] += 1
+    return {
+        "backend": backend,
+        "workers": workers,
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_sec": rows / elapsed if elapsed else 0.0,
+        "p50_seconds": percentile(latencies, 0.50),
+        "p95_seconds": percentile(latencies, 0.95),
+        "p99_seconds": percentile(latencies, 0.99),
+        "driver_startup_seconds": statistics.mean(startups) if startups else None,
+        "drivers_started": len(startups),
+        # ru_maxrss is in KiB on Linux; children covers browsers started with real_browser
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "peak_children_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+        "outcomes": outcomes,
+    }
+
+def run_throughput_suite(backends, worker_counts, rows, latency, miss_rate, error_rate, rate=None, driver_startup=0.0,
+                         real_browser=False, seed=0):
+    """Run every backend and worker count against one fake server, each run in its own process for clean RSS"""
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    with FakeSearchServer(latency, miss_rate, error_rate, seed) as server:
+        for backend in backends:
+            for workers in worker_counts:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    runs.append(executor.submit(
+                        run_throughput, backend, workers, rows, server.url, rate, driver_startup, real_browser
+                    ).result())
+    return {
+        "server": {"latency": latency, "miss_rate": miss_rate, "error_rate": error_rate, "seed": seed},
+        "rate": rate,
+        "runs": runs,
+    }
+
+def print_throughput_report(report):
+    print(f"{'backend':<10}{'workers':>8}{'rows/s':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'startup':>9}{'RSS MB':>9}")
+    for run in report["runs"]:
+        startup = run["driver_startup_seconds"]
+        print(
+            f"{run['backend']:<10}{run['workers']:>8}{run['rows_per_sec']:>10.2f}{run['p50_seconds']:>8.3f}s"
+            f"{run['p95_seconds']:>8.3f}s{run['p99_seconds']:>8.3f}s"
+            f"{'-' if startup is None else f'{startup:.3f}s':>9}{run['peak_rss_mb']:>9.1f}"
+        )
+
+# Runs in a fresh interpreter per measurement; prints one JSON line
+STARTUP_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app
+report = {"import_seconds": time.perf_counter() - started}
+report["heavy_modules"] = sorted(m for m in ("selenium", "webdriver_manager", "google.cloud.storage") if m in sys.modules)
+started = time.perf_counter()
+try:
+    app.chromedriver_path()
+    report["chromedriver_seconds"] = time.perf_counter() - started
+except Exception as e:
+    report["chromedriver_error"] = f"{type(e).__name__}: {e}"[:200]
+if sys.argv[1] == "1" and "chromedriver_error" not in report:
+    started = time.perf_counter()
+    app.setup_driver().quit()
+    report["first_driver_seconds"] = time.perf_counter() - started
+print(json.dumps(report))
+"""
+
+def run_startup(runs, real_browser=False):
+    """Time cold imports, chromedriver resolution and (optionally) the first browser in fresh interpreters
+
+    The first run starts with an empty chromedriver cache; later runs reuse what it remembered.
+    """
+    samples = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, CLUTCH_CHROMEDRIVER_CACHE=str(Path(cache_dir) / "chromedriver_path"))
+        for _ in range(runs):
+            started = time.perf_counter()
+            completed = subprocess.run([sys.executable, "-c", STARTUP_PROBE, "1" if real_browser else "0"],
+                                       cwd=Path(__file__).resolve().parent, env=env, capture_output=True, text=True,
+                                       check=True)
+            sample = json.loads(completed.stdout.strip().splitlines()[-1])
+            sample["process_seconds"] = time.perf_counter() - started
+            samples.append(sample)
+
+    def median(name, runs=samples):
+        values = [s[name] for s in runs if name in s]
+        return statistics.median(values) if values else None
+
+    return {
+        "runs": samples,
+        "median_process_seconds": median("process_seconds"),
+        "median_import_seconds": median("import_seconds"),
+        "cold_chromedriver_seconds": samples[0].get("chromedriver_seconds") if samples else None,
+        "cached_chromedriver_seconds": median("chromedriver_seconds", samples[1:]),
+        "median_first_driver_seconds": median("first_driver_seconds"),
+    }
+
+def print_startup_report(report):
+    def seconds(value):
+        return "-" if value is None else f"{value:.3f}s"
+
+    print(f"{'process start + import':<28}{seconds(report['median_process_seconds']):>10}")
+    print(f"{'import app':<28}{seconds(report['median_import_seconds']):>10}")
+    print(f"{'chromedriver (cold)':<28}{seconds(report['cold_chromedriver_seconds']):>10}")
+    print(f"{'chromedriver (cached)':<28}{seconds(report['cached_chromedriver_seconds']):>10}")
+    print(f"{'first browser':<28}{seconds(report['median_first_driver_seconds']):>10}")
+    heavy = sorted({m for run in report["runs"] for m in run["heavy_modules"]})
+    print(f"Heavy modules loaded by import: {', '.join(heavy) or 'none'}")
+    errors = {run["chromedriver_error"] for run in report["runs"] if "chromedriver_error" in run}
+    for error in errors:
+        print(f"chromedriver unavailable: {error}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Performance measurements for the LinkedIn lookup pipeline")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    lean = commands.add_parser("lean", help="Compare bytes and page-load time per lookup with and without the lean profile")
+    lean.add_argument("--queries", help="CSV export to sample reviewers from (default: built-in samples)")
+    lean.add_argument("--limit", type=int, default=5, help="Number of distinct reviewers to search")
+    lean.add_argument("--repeats", type=int, default=1, help="Times to repeat each search")
+    lean.add_argument("--output", help="Also write the report as JSON to this path")
+
+    throughput = commands.add_parser("throughput", help="Rows/sec and latency per backend and worker count against a local fake search server")
+    throughput.add_argument("--backends", nargs="+", choices=["http", "selenium"], default=["http", "selenium"])
+    throughput.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4, 8], help="Worker counts to try")
+    throughput.add_argument("--rows", type=int, default=200, help="Lookups per run")
+    throughput.add_argument("--latency", type=float, default=0.2, help="Mean server response time in seconds")
+    throughput.add_argument("--miss-rate", type=float, default=0.2, help="Share of searches without results")
+    throughput.add_argument("--error-rate", type=float, default=0.01, help="Share of searches answered with HTTP 500")
+    throughput.add_argument("--rate", type=float, help="Apply a token bucket at this many lookups/s (default: unthrottled)")
+    throughput.add_argument("--driver-startup", type=float, default=0.0, help="Simulated seconds to start a scripted driver")
+    throughput.add_argument("--real-browser", action="store_true", help="Drive real headless Chrome instead of scripted drivers")
+    throughput.add_argument("--seed", type=int, default=0)
+    throughput.add_argument("--output", help="Also write the report as JSON to this path")
+
+    startup = commands.add_parser("startup", help="Cold-start cost: imports, chromedriver resolution and the first browser")
+    startup.add_argument("--runs", type=int, default=5, help="Fresh interpreters to start")
+    startup.add_argument("--real-browser", action="store_true", help="Also start and quit headless Chrome in every run")
+    startup.add_argument("--output", help="Also write the report as JSON to this path")
+
+    args = parser.parse_args(argv)
+    if args.command == "lean":
+        report = run_lean_comparison(load_queries(args.queries, args.limit), args.repeats)
+        print_lean_report(report)
+    elif args.command == "throughput":
+        report = run_throughput_suite(args.backends, args.workers, args.rows, args.latency, args.miss_rate,
+                                      args.error_rate, args.rate, args.driver_startup, args.real_browser, args.seed)
+        print_throughput_report(report)
+    elif args.command == "startup":
+        report = run_startup(args.runs, args.real_browser)
+        print_startup_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
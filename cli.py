@@ -0,0 +1,357 @@
+import argparse
+import collections
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+import app
+
+REQUIRED_COLUMNS = ['Reviewer Name', 'Reviewer Company']
+
+# Exit codes
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+def emit(event, **fields):
+    """Write one JSON progress line to stdout"""
+    print(json.dumps({"event": event, "time": round(time.time(), 3), **fields}), flush=True)
+
+def collect_inputs(paths):
+    """Expand files and directories into the CSV files to process"""
+    inputs = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            inputs.extend(sorted(path.glob("*.csv")))
+        elif path.is_file():
+            inputs.append(path)
+        else:
+            raise FileNotFoundError(f"No such file or directory: {path}")
+    return inputs
+
+def collect_pages(sources):
+    """Keep URLs and expand saved HTML pages and directories of them"""
+    pages = []
+    for source in sources:
+        path = Path(source)
+        if "://" in source:
+            pages.append(source)
+        elif path.is_dir():
+            pages.extend(str(p) for p in sorted(path.glob("*.htm*")))
+        elif path.is_file():
+            pages.append(str(path))
+        else:
+            raise FileNotFoundError(f"No such file or directory: {path}")
+    return pages
+
+def plan_inputs(inputs):
+    """Validate every input and collect the unique queries across all of them"""
+    valid, work = [], {}
+    for path in inputs:
+        columns = pd.read_csv(path, nrows=0).columns
+        missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+        if missing:
+            emit("file_failed", file=str(path), error=f"missing required columns: {missing}")
+            continue
+        rows = 0
+        for chunk in pd.read_csv(path, chunksize=app.STREAM_CHUNK_ROWS):
+            _, chunk_work = app.plan_queries([chunk])
+            for key, name, company in zip(chunk_work.index, chunk_work['Reviewer Name'], chunk_work['Reviewer Company']):
+                work.setdefault(key, (name, company))
+            rows += len(chunk)
+        valid.append(path)
+        emit("file_planned", file=str(path), rows=rows)
+    return valid, work
+
+def write_shards(work, processes, directory):
+    """Split unique queries across processes by a stable hash of their key"""
+    shards = [[] for _ in range(processes)]
+    for key, (name, company) in work.items():
+        shards[zlib.crc32(key.encode("utf-8")) % processes].append((key, name, company))
+
+    paths = []
+    for shard_id, rows in enumerate(shards):
+        if not rows:
+            continue
+        path = Path(directory) / f"shard_{shard_id}.csv"
+        pd.DataFrame(rows, columns=['key'] + REQUIRED_COLUMNS).to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+def run_shard(shard_path, workers, backend, rate_share, progress_queue=None, hedge=app.HEDGE_LOOKUPS):
+    """Look up one shard of queries with a scheduler; runs inside a worker process"""
+    # Every process gets an equal share of the per-host politeness budget and of the machine
+    throttle = app.get_token_bucket(app.search_host(backend))
+    throttle.rate *= rate_share
+    if isinstance(throttle, app.AdaptiveThrottle):
+        throttle.min_rate *= rate_share
+        throttle.max_rate *= rate_share
+    governor = app.get_worker_governor(backend)
+    governor.share = rate_share
+    governor.pin(workers)
+
+    output_path = shard_path.with_name(f"{shard_path.stem}_results.csv")
+    with open(shard_path, "rb") as f:
+        checkpoint = app.Checkpoint(app.upload_checkpoint_id(f))
+
+    def report(job):
+        if progress_queue is not None:
+            progress_queue.put((shard_path.name, job.done_rows, job.total_rows))
+
+    scheduler = app.LookupScheduler(max_workers=None, backend=backend, hedge=hedge)
+    scheduler.add_file(app.FileJob(shard_path.name, shard_path, output_path, checkpoint=checkpoint))
+    scheduler.run(report)
+    checkpoint.remove()
+    return output_path
+
+def finish_output(output_path, failed_rows, formats):
+    """Export an output in the extra formats and publish it, with its failed-row report, to the configured sinks"""
+    exports = [app.export_table(output_path, output_format) for output_format in formats]
+    failed_path = app.failed_path_for(output_path)
+    artifacts = [output_path] + exports + [failed_path] * bool(failed_rows)
+    published, errors = app.publish_artifacts(artifacts, [app.artifact_sink(s) for s in app.ARTIFACT_SINKS])
+    return {
+        "exports": [str(path) for path in exports],
+        "failed_output": str(failed_path) if failed_rows else None,
+        "published": published,
+        "publish_errors": errors,
+    }
+
+def write_outputs(inputs, results, failures, output_dir, formats=()):
+    """Stream every input again and write it with the looked-up profiles and a report of failed rows"""
+    for path in inputs:
+        output_path = Path(output_dir) / f"processed_{path.name}"
+        written = app.write_processed_csv(path, output_path, results)
+        failed = app.write_failed_rows(path, app.failed_path_for(output_path), failures)
+        emit("file_completed", file=str(path), output=str(output_path), rows=written, failed_rows=failed,
+             **finish_output(output_path, failed, formats))
+
+def valid_inputs(paths, output_dir):
+    """Inputs with the required columns, or None when there is nothing to process"""
+    inputs = collect_inputs(paths)
+    if not inputs:
+        emit("failed", error="no CSV inputs found")
+        return None
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    return inputs
+
+def run(args):
+    inputs = valid_inputs(args.inputs, args.output_dir)
+    if inputs is None:
+        return EXIT_USAGE
+
+    valid, work = plan_inputs(inputs)
+    failed_files = len(inputs) - len(valid)
+    processes = max(1, min(args.processes, len(work)))
+    emit("planned", files=len(valid), unique_queries=len(work), processes=processes, workers=args.workers or "auto",
+         backend=args.backend)
+
+    results, failures = {}, {}
+    with tempfile.TemporaryDirectory(dir=app.CLUTCH_DATA_DIR) as shard_dir:
+        shard_paths = write_shards(work, processes, shard_dir)
+        progress = {}
+        last_report = 0.0
+        started = time.monotonic()
+
+        def report(shard, done, total):
+            nonlocal last_report
+            progress[shard] = (done, total)
+            if time.monotonic() - last_report >= args.progress_interval:
+                last_report = time.monotonic()
+                done_all = sum(d for d, _ in progress.values())
+                elapsed = time.monotonic() - started
+                emit("progress", done=done_all, total=len(work),
+                     rate=round(done_all / elapsed, 2) if elapsed else 0.0)
+
+        if processes == 1:
+            outputs = [run_shard(path, args.workers, args.backend, 1.0, None, args.hedge) for path in shard_paths]
+        else:
+            context = multiprocessing.get_context("spawn")
+            with context.Manager() as manager, ProcessPoolExecutor(processes, mp_context=context) as executor:
+                progress_queue = manager.Queue()
+                futures = [
+                    executor.submit(run_shard, path, args.workers, args.backend, 1.0 / processes, progress_queue, args.hedge)
+                    for path in shard_paths
+                ]
+                while not all(f.done() for f in futures):
+                    try:
+                        report(*progress_queue.get(timeout=0.5))
+                    except Exception:
+                        continue
+                outputs = [f.result() for f in as_completed(futures)]
+
+        for output in outputs:
+            frame = pd.read_csv(output, keep_default_na=False)
+            results.update(zip(frame['key'], frame['LinkedIn Profile']))
+            failed_path = app.failed_path_for(output)
+            if failed_path.exists():
+                failed = pd.read_csv(failed_path, keep_default_na=False)
+                failures.update(zip(failed['key'], zip(*(failed[column] for column in app.FAILURE_COLUMNS))))
+        emit("progress", done=len(results), total=len(work),
+             rate=round(len(results) / max(time.monotonic() - started, 1e-9), 2))
+
+    write_outputs(valid, results, failures, args.output_dir, args.formats)
+    errors = sum(result == "Error" for result in results.values())
+    emit("done", files=len(valid), failed_files=failed_files, unique_queries=len(work), errors=errors,
+         failure_reasons=dict(collections.Counter(reason for reason, _, _ in failures.values())),
+         seconds=round(time.monotonic() - started, 2))
+    return EXIT_FAILED if failed_files or errors else EXIT_OK
+
+def submit(args):
+    """Queue inputs on the shared job queue; with --wait, follow them and write the outputs"""
+    inputs = valid_inputs(args.inputs, args.output_dir)
+    if inputs is None:
+        return EXIT_USAGE
+
+    job_queue = app.SqliteLeaseQueue(args.queue)
+    submitter = app.QueueSubmitter(job_queue)
+    failed_files = 0
+    for path in inputs:
+        columns = pd.read_csv(path, nrows=0).columns
+        missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+        if missing:
+            emit("file_failed", file=str(path), error=f"missing required columns: {missing}")
+            failed_files += 1
+            continue
+        job = submitter.add_file(app.FileJob(str(path), path, Path(args.output_dir) / f"processed_{path.name}"))
+        emit("file_submitted", file=str(path), rows=job.total_rows)
+
+    if args.wait:
+        def report(job):
+            emit("progress", file=job.name, done=job.done_rows, total=job.total_rows)
+
+        def complete(job):
+            emit("file_completed", file=job.name, output=str(job.output_path), rows=job.written_rows,
+                 failed_rows=job.failed_rows, **finish_output(job.output_path, job.failed_rows, args.formats))
+
+        submitter.run(report, complete)
+    emit("done", files=len(submitter.jobs), failed_files=failed_files)
+    return EXIT_FAILED if failed_files else EXIT_OK
+
+def worker(args):
+    """Serve lookups from the shared job queue"""
+    worker_id = args.worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    governor = app.get_worker_governor(args.backend)
+    governor.pin(args.workers)
+    emit("worker_started", worker=worker_id, workers=args.workers or "auto", max_workers=governor.ceiling,
+         backend=args.backend, queue=str(args.queue))
+    completed = app.run_queue_worker(app.SqliteLeaseQueue(args.queue), worker_id, None, args.backend,
+                                     idle_timeout=args.idle_timeout)
+    emit("worker_stopped", worker=worker_id, completed=completed)
+    return EXIT_OK
+
+def harvest(args):
+    """Harvest reviews from Clutch pages and look up their reviewers without a CSV in between"""
+    pages = collect_pages(args.sources)
+    if not pages:
+        emit("failed", error="no pages to harvest")
+        return EXIT_USAGE
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+
+    started = time.monotonic()
+    harvester = app.ReviewHarvester(workers=args.fetchers)
+    companies = harvester.harvest(pages)
+    for url, reason, error in harvester.failures:
+        emit("page_failed", url=url, reason=reason, error=error)
+    emit("harvested", companies=len(companies), reviews=sum(map(len, companies.values())), pages=harvester.pages,
+         duplicates=harvester.duplicates, failed_pages=len(harvester.failures),
+         seconds=round(time.monotonic() - started, 2))
+
+    if args.no_lookup:
+        for filename, df in companies.items():
+            output_path = Path(args.output_dir) / filename
+            df.to_csv(output_path, index=False)
+            emit("file_completed", file=filename, output=str(output_path), rows=len(df),
+                 **finish_output(output_path, 0, args.formats))
+        emit("done", files=len(companies), failed_pages=len(harvester.failures),
+             seconds=round(time.monotonic() - started, 2))
+        return EXIT_FAILED if harvester.failures else EXIT_OK
+
+    # Harvested rows go through the same scheduler as "run", with its retries and failed-row reports
+    app.get_worker_governor(args.backend).pin(args.workers)
+    scheduler = app.LookupScheduler(max_workers=None, backend=args.backend, hedge=args.hedge)
+    for filename, df in companies.items():
+        scheduler.add_file(app.FileJob(filename, None, Path(args.output_dir) / f"processed_{filename}", frame=df))
+
+    def complete(job):
+        emit("file_completed", file=job.name, output=str(job.output_path), rows=job.written_rows,
+             failed_rows=job.failed_rows, **finish_output(job.output_path, job.failed_rows, args.formats))
+
+    scheduler.run(complete_callback=complete)
+    failed_rows = sum(job.failed_rows for job in scheduler.jobs)
+    emit("done", files=len(companies), failed_pages=len(harvester.failures), failed_rows=failed_rows,
+         seconds=round(time.monotonic() - started, 2))
+    return EXIT_FAILED if harvester.failures or failed_rows else EXIT_OK
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Find LinkedIn profiles for Clutch reviewer CSVs without the web UI")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def output_options(command):
+        command.add_argument("-o", "--output-dir", default=str(app.CLUTCH_DATA_DIR), help="Where processed_<name>.csv files go")
+        command.add_argument("--formats", nargs="+", choices=sorted(app.EXPORT_EXTENSIONS), default=app.OUTPUT_FORMATS,
+                             help="Also write each output in these formats (needs pyarrow)")
+
+    def lookup_options(command):
+        command.add_argument("-w", "--workers", type=int, default=app.DEFAULT_MAX_WORKERS,
+                             help="Lookup workers per process (default: sized from CPU, memory and browser RSS)")
+        command.add_argument("-b", "--backend", choices=sorted(app.RESOLVER_BACKENDS), default=app.SEARCH_BACKEND,
+                             help="Search backend")
+
+    run_command = commands.add_parser("run", help="Look up every input in this machine's worker processes")
+    run_command.add_argument("inputs", nargs="+", help="CSV files or directories of CSV files")
+    output_options(run_command)
+    run_command.add_argument("-p", "--processes", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    run_command.add_argument("--progress-interval", type=float, default=1.0, help="Seconds between progress lines")
+    run_command.add_argument("--hedge", action="store_true", default=app.HEDGE_LOOKUPS,
+                             help="Start a second copy of lookups slower than the recent p95 (bounded extra load)")
+    lookup_options(run_command)
+
+    submit_command = commands.add_parser("submit", help="Queue inputs for distributed workers")
+    submit_command.add_argument("inputs", nargs="+", help="CSV files or directories of CSV files")
+    output_options(submit_command)
+    submit_command.add_argument("--queue", default=str(app.JOB_QUEUE_PATH), help="Job queue database")
+    submit_command.add_argument("--wait", action="store_true", help="Follow progress and write outputs when done")
+
+    worker_command = commands.add_parser("worker", help="Look up queries leased from the shared job queue")
+    worker_command.add_argument("--queue", default=str(app.JOB_QUEUE_PATH), help="Job queue database")
+    worker_command.add_argument("--worker-id", help="Name used for leases (default: host:pid)")
+    worker_command.add_argument("--idle-timeout", type=float, help="Exit after this many seconds without work")
+    lookup_options(worker_command)
+
+    harvest_command = commands.add_parser("harvest", help="Scrape reviews from Clutch profiles and look up their reviewers")
+    harvest_command.add_argument("sources", nargs="+",
+                                 help="Clutch profile or directory URLs, saved HTML pages or directories of them")
+    output_options(harvest_command)
+    harvest_command.add_argument("--fetchers", type=int, default=app.HARVEST_WORKERS, help="Review pages fetched at once")
+    harvest_command.add_argument("--no-lookup", action="store_true",
+                                 help="Only write <company>_reviews.csv, as the userscript did")
+    harvest_command.add_argument("--hedge", action="store_true", default=app.HEDGE_LOOKUPS,
+                                 help="Start a second copy of lookups slower than the recent p95 (bounded extra load)")
+    lookup_options(harvest_command)
+    return parser
+
+COMMANDS = {"run": run, "submit": submit, "worker": worker, "harvest": harvest}
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return COMMANDS[args.command](args)
+    except FileNotFoundError as e:
+        emit("failed", error=str(e))
+        return EXIT_USAGE
+    except Exception as e:
+        emit("failed", error=f"{type(e).__name__}: {e}")
+        return EXIT_FAILED
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""Shared fixtures: the app module on sys.path and lookups kept out of the real cache and rate limits"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import app  # noqa: E402
+
+@pytest.fixture
+def lookup_cache(tmp_path, monkeypatch):
+    """A fresh LookupCache in place of the process-wide one"""
+    cache = app.LookupCache(tmp_path / "lookup_cache.sqlite3")
+    monkeypatch.setattr(app, "get_lookup_cache", lambda: cache)
+    yield cache
+    cache.close()
+
+@pytest.fixture
+def fast_buckets(monkeypatch):
+    """Unthrottled per-host rate limiters, so lookups don't wait out the real politeness delay"""
+    buckets = {}
+    monkeypatch.setattr(app, "get_token_bucket",
+                        lambda host: buckets.setdefault(host, app.TokenBucket(rate=1000.0, burst=100, jitter=(0, 0))))
+    return buckets
+
+def write_reviews(path, rows):
+    """Write an upload CSV of (name, company) reviewer rows"""
+    app.pd.DataFrame(rows, columns=['Reviewer Name', 'Reviewer Company']).to_csv(path, index=False)
+    return path
@@ -0,0 +1,173 @@
+"""Write-once artifacts: columnar exports, the ZIP and the sinks they are published to (run with: python -m pytest tests)"""
+import base64
+import json
+import os
+import threading
+import urllib.parse
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+import app
+
+class FakeBucketServer:
+    """Just enough of the Cloud Storage JSON API for uploads: single-request and resumable, chunk by chunk"""
+
+    def __init__(self):
+        self.objects = {}  # (bucket, name) -> (bytes, content type)
+        self.chunks = []  # Content-Range of every resumable chunk received
+        self._uploads = {}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _read(self):
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+            def _reply(self, status, body=None, headers=()):
+                payload = json.dumps(body).encode("utf-8") if body is not None else b""
+                self.send_response(status)
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _stored(self, bucket, name, data, content_type):
+                import google_crc32c  # Installed with google-cloud-storage, which checks it on resumable uploads
+
+                server.objects[(bucket, name)] = (bytes(data), content_type)
+                checksum = base64.b64encode(google_crc32c.Checksum(bytes(data)).digest()).decode()
+                self._reply(200, {"bucket": bucket, "name": name, "size": str(len(data)), "crc32c": checksum})
+
+            def do_POST(self):
+                url = urllib.parse.urlparse(self.path)
+                query = urllib.parse.parse_qs(url.query)
+                bucket = url.path.split("/b/", 1)[1].split("/", 1)[0]
+                body = self._read()
+                if query["uploadType"] == ["multipart"]:
+                    # Headers, JSON metadata, the media part's headers, then the media up to the closing boundary
+                    _, metadata, media = body.split(b"\r\n\r\n", 2)
+                    metadata, media_headers = metadata.split(b"\r\n", 1)
+                    content_type = media_headers.rsplit(b"content-type: ", 1)[1].decode()
+                    data = media.rsplit(b"\r\n--", 1)[0]
+                    return self._stored(bucket, json.loads(metadata)["name"], data, content_type)
+                metadata = json.loads(body or b"{}")
+                upload_id = str(len(server._uploads))
+                server._uploads[upload_id] = (bucket, metadata.get("name") or query["name"][0],
+                                              self.headers.get("X-Upload-Content-Type"), bytearray())
+                self._reply(200, {}, [("Location", f"{server.url}/upload/resumable/{upload_id}")])
+
+            def do_PUT(self):
+                bucket, name, content_type, data = server._uploads[self.path.rsplit("/", 1)[1]]
+                data += self._read()
+                content_range = self.headers["Content-Range"]
+                server.chunks.append(content_range)
+                total = content_range.rsplit("/", 1)[1]
+                if total == "*" or len(data) < int(total):
+                    self.send_response(308)
+                    self.send_header("Range", f"bytes=0-{len(data) - 1}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self._stored(bucket, name, data, content_type)
+
+        return Handler
+
+@pytest.fixture
+def processed_csv(tmp_path):
+    path = tmp_path / "processed_reviews.csv"
+    pd.DataFrame({
+        'Reviewer Name': ["Maria Anders", "Anonymous", "Hank Scorpio"] * 400,
+        'Reviewer Company': ["Northwind", "", "00123"] * 400,
+        'LinkedIn Profile': ["https://www.linkedin.com/in/maria-anders", "Anonymous", "Not Found"] * 400,
+    }).to_csv(path, index=False)
+    return path
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrow"])
+def test_export_keeps_every_column_as_text(processed_csv, output_format):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    exported = app.export_table(processed_csv, output_format, block_size=4096)
+
+    assert exported == processed_csv.with_suffix(app.EXPORT_EXTENSIONS[output_format])
+    table = pq.read_table(exported) if output_format == "parquet" else pa.ipc.open_file(exported).read_all()
+    assert table.schema.types == [pa.string()] * 3
+    frame = table.to_pandas()
+    assert frame.equals(pd.read_csv(processed_csv, dtype=str, keep_default_na=False))
+    assert frame['Reviewer Company'][2] == "00123"
+
+def test_export_of_an_empty_output(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "processed_empty.csv"
+    pd.DataFrame(columns=['Reviewer Name', 'LinkedIn Profile']).to_csv(path, index=False)
+
+    table = pq.read_table(app.export_table(path, "parquet"))
+    assert table.num_rows == 0 and table.column_names == ['Reviewer Name', 'LinkedIn Profile']
+
+def test_zip_and_directory_sink(tmp_path, processed_csv):
+    zip_path = app.write_zip([processed_csv], tmp_path / "processed_linkedin_files.zip")
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.read(processed_csv.name) == processed_csv.read_bytes()
+
+    mirror = tmp_path / "mirror"
+    published, errors = app.publish_artifacts([processed_csv, zip_path], [app.artifact_sink(str(mirror))], "job1")
+
+    assert errors == {}
+    assert published[processed_csv.name] == [str(mirror / "job1" / processed_csv.name)]
+    assert (mirror / "job1" / zip_path.name).read_bytes() == zip_path.read_bytes()
+
+def test_gcs_sink_uploads_to_a_fake_bucket(tmp_path, processed_csv, monkeypatch):
+    pytest.importorskip("google.cloud.storage")
+    big = tmp_path / "processed_big.csv"
+    big.write_bytes(os.urandom((8 << 20) + 1000))  # Past the client's limit for single-request uploads
+
+    with FakeBucketServer() as bucket:
+        monkeypatch.setenv("STORAGE_EMULATOR_HOST", bucket.url)
+        sink = app.artifact_sink("gs://exports/clutch/")
+        sink.chunk_size = 2 << 20
+        published, errors = app.publish_artifacts([processed_csv, big], [sink], "job1")
+
+    assert errors == {}
+    assert published == {
+        processed_csv.name: [f"gs://exports/clutch/job1/{processed_csv.name}"],
+        big.name: ["gs://exports/clutch/job1/processed_big.csv"],
+    }
+    data, content_type = bucket.objects[("exports", f"clutch/job1/{processed_csv.name}")]
+    assert data == processed_csv.read_bytes() and content_type == "text/csv"
+    assert bucket.objects[("exports", "clutch/job1/processed_big.csv")][0] == big.read_bytes()
+    # Four full chunks and a short last one
+    assert len(bucket.chunks) == 5
+    assert bucket.chunks[0] == "bytes 0-2097151/8389608" and bucket.chunks[-1] == "bytes 8388608-8389607/8389608"
+
+def test_publish_errors_are_collected_per_file(tmp_path, processed_csv):
+    class BrokenSink(app.ArtifactSink):
+        def put(self, path, name):
+            raise ConnectionError("bucket unreachable")
+
+    published, errors = app.publish_artifacts([processed_csv], [BrokenSink()])
+
+    assert published == {}
+    assert errors == {processed_csv.name: "ConnectionError: bucket unreachable"}
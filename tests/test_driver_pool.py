@@ -0,0 +1,55 @@
+"""Driver pool reuse and health checks with stand-in drivers (run with: python -m pytest tests)"""
+import pytest
+
+import app
+
+class CountingDriver:
+    """Stand-in WebDriver that counts session round trips and can be made to die"""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.dead = False
+        self.quit_called = False
+
+    @property
+    def current_url(self):
+        self.round_trips += 1
+        if self.dead:
+            raise ConnectionRefusedError("chromedriver is gone")
+        return "about:blank"
+
+    def quit(self):
+        self.quit_called = True
+
+def test_recently_used_drivers_are_reused_without_a_round_trip():
+    pool = app.DriverPool(size=1, factory=CountingDriver, idle_check=60)
+    for _ in range(5):
+        with pool.lease():
+            pass
+
+    driver, = pool.drivers()
+    assert driver.round_trips == 0
+    assert pool.stats()["created"] == 1 and pool.stats()["checkouts"] == 5
+
+def test_long_idle_driver_is_checked_and_replaced_if_dead():
+    pool = app.DriverPool(size=1, factory=CountingDriver, idle_check=0)
+    with pool.lease() as first:
+        pass
+    first.dead = True
+
+    with pool.lease() as second:
+        pass
+
+    assert second is not first and first.quit_called
+    assert pool.stats()["crashed"] == 1
+
+def test_driver_that_failed_a_lookup_is_checked_at_checkin():
+    pool = app.DriverPool(size=1, factory=CountingDriver, idle_check=60)
+    with pytest.raises(app.SearchTimeoutError):
+        with pool.lease() as driver:
+            driver.dead = True
+            raise app.SearchTimeoutError("results never rendered")
+
+    assert driver.quit_called and pool.drivers() == []
+    with pool.lease() as replacement:
+        assert replacement is not driver
@@ -0,0 +1,36 @@
+"""Classification of lookup exceptions into retryable and final failures (run with: python -m pytest tests)"""
+import asyncio
+import socket
+import urllib.error
+
+import pytest
+
+import app
+
+def http_error(code):
+    return urllib.error.HTTPError("https://html.duckduckgo.com/html/", code, "status", None, None)
+
+@pytest.mark.parametrize("exc, reason, retryable", [
+    (http_error(429), "blocked", True),
+    (http_error(403), "blocked", True),
+    (http_error(503), "network", True),
+    (http_error(404), "network", False),
+    (socket.timeout("timed out"), "timeout", True),
+    (urllib.error.URLError(socket.timeout("timed out")), "timeout", True),
+    (asyncio.TimeoutError(), "timeout", True),
+    (urllib.error.URLError(ConnectionRefusedError(111, "refused")), "network", True),
+    (ConnectionResetError(104, "reset by peer"), "network", True),
+    (KeyError("title"), "error", False),
+])
+def test_to_failure(exc, reason, retryable):
+    failure = app.to_failure(exc)
+
+    assert isinstance(failure, app.LookupFailure)
+    assert (failure.reason, failure.retryable) == (reason, retryable)
+    assert type(exc).__name__ in str(failure)
+
+def test_lookup_failures_pass_through():
+    failure = app.SearchBlockedError("Results page replaced by a bot check")
+
+    assert app.to_failure(failure) is failure
+    assert app.classify_failure(failure) == "blocked"
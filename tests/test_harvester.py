@@ -0,0 +1,85 @@
+"""Smoke checks for the review harvester against saved Clutch pages (run with: python -m pytest tests)"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import app  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+SITE = {
+    "https://clutch.co/directory/web-developers": "clutch_directory.html",
+    "https://clutch.co/profile/acme-dev-studio": "clutch_profile.html",
+    "https://clutch.co/profile/acme-dev-studio?page=1": "clutch_profile_page1.html",
+}
+
+def fetch_fixture(url):
+    if url not in SITE:
+        raise app.SearchNetworkError(f"No fixture for {url}", retryable=False)
+    return (FIXTURES / SITE[url]).read_text(encoding="utf-8")
+
+@pytest.fixture(autouse=True)
+def fast_throttle():
+    throttle = app.get_token_bucket("clutch.co")
+    rate, jitter = throttle.rate, throttle.jitter
+    throttle.rate, throttle.jitter = 1000.0, (0, 0)
+    yield
+    throttle.rate, throttle.jitter = rate, jitter
+
+def test_parse_profile_page():
+    page = app.parse_review_page(fetch_fixture("https://clutch.co/profile/acme-dev-studio"))
+
+    assert page.company == "Acme Dev Studio"
+    assert page.last_page == 1
+    assert [review_id for review_id, _ in page.reviews] == ["2101", "2102", "2103"]
+    # Same columns and "swapped" mapping as the userscript's CSVs
+    assert page.reviews[0][1] == {
+        'Reviewer Company': "CTO, Northwind Traders",
+        'Reviewer Name': "Maria Anders",
+        'Location': "Berlin, Germany",
+        'Company Size': "51-200 Employees",
+        'Review Type': "Online Review",
+    }
+    assert page.reviews[1][1]['Reviewer Company'] == "Founder & CEO, Blue Yonder Labs"
+    assert page.reviews[1][1]['Review Type'] == "Phone Interview"
+    assert page.reviews[2][1]['Location'] == "N/A"
+
+def test_last_page_comes_from_the_link_href():
+    assert app.last_page_number({"href": "/profile/x?page=7#reviews", "data-page": "6"}) == 7
+    assert app.last_page_number({"data-page": "3"}) == 3
+    assert app.last_page_number({}) == 0
+    assert app.review_page_url("https://clutch.co/profile/x?page=4#reviews", 2) == "https://clutch.co/profile/x?page=2#reviews"
+    assert app.review_page_url("https://clutch.co/profile/x?page=4", 0) == "https://clutch.co/profile/x"
+
+def test_harvest_directory_follows_pages_and_dedups():
+    harvester = app.ReviewHarvester(fetch=fetch_fixture, workers=4)
+    companies = harvester.harvest(["https://clutch.co/directory/web-developers"])
+
+    assert harvester.failures == []
+    assert harvester.pages == 3
+    assert harvester.duplicates == 1
+    assert list(companies) == ["Acme Dev Studio_reviews.csv"]
+    frame = companies["Acme Dev Studio_reviews.csv"]
+    assert list(frame.columns) == app.REVIEW_COLUMNS
+    assert list(frame['Reviewer Name']) == ["Maria Anders", "Anonymous", "Hank Scorpio", "Bill Lumbergh"]
+
+def test_harvest_saved_pages_and_missing_ones():
+    harvester = app.ReviewHarvester(workers=2)
+    companies = harvester.harvest([
+        str(FIXTURES / "clutch_profile_page1.html"), str(FIXTURES / "clutch_profile.html"), str(FIXTURES / "missing.html"),
+    ])
+
+    assert len(companies["Acme Dev Studio_reviews.csv"]) == 4
+    assert harvester.duplicates == 1
+    assert [url for url, _, _ in harvester.failures] == [str(FIXTURES / "missing.html")]
+
+def test_saved_directory_links_resolve_against_clutch():
+    def fetch(url):
+        return fetch_fixture(url) if "://" in url else (FIXTURES / url).read_text(encoding="utf-8")
+
+    harvester = app.ReviewHarvester(fetch=fetch, workers=2)
+    companies = harvester.harvest(["clutch_directory.html"])
+
+    assert harvester.failures == []
+    assert len(companies["Acme Dev Studio_reviews.csv"]) == 4
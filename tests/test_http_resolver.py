@@ -0,0 +1,58 @@
+"""HttpResolver against benchmark.FakeSearchServer, the local stand-in for the search endpoint (run with: python -m pytest tests)"""
+import asyncio
+import urllib.error
+
+import pytest
+
+import app
+from benchmark import FakeSearchServer
+
+def lookup(resolver, name="Jane Doe", company="CEO, Acme Consulting"):
+    row = {'Reviewer Name': name, 'Reviewer Company': company}
+    return app.process_row(row, resolver, raise_failures=True)
+
+@pytest.fixture
+def search_server(request):
+    with FakeSearchServer(latency=0, error_rate=0, **request.param) as server:
+        yield server
+
+@pytest.mark.parametrize("search_server", [{"miss_rate": 0}], indirect=True)
+def test_hit_returns_the_unwrapped_profile_link(search_server):
+    resolver = app.HttpResolver(search_server.url)
+    candidates = resolver.search_candidates(app.build_query("Jane Doe", "Acme Consulting"))
+
+    assert [c["href"] for c in candidates] == [
+        "https://www.linkedin.com/in/jane-doe", "https://clutch.co/profile/example", "https://example.com/team",
+    ]
+    assert candidates[0]["title"].endswith("- LinkedIn")
+    assert lookup(resolver) == "https://www.linkedin.com/in/jane-doe"
+    assert asyncio.run(app.process_row_async({'Reviewer Name': "Jane Doe", 'Reviewer Company': "Acme Consulting"},
+                                             resolver)) == "https://www.linkedin.com/in/jane-doe"
+
+@pytest.mark.parametrize("search_server", [{"miss_rate": 1}], indirect=True)
+def test_no_match_is_not_found(search_server):
+    resolver = app.HttpResolver(search_server.url)
+
+    assert resolver.search_candidates("Nobody site:linkedin.com/in") == []
+    assert lookup(resolver) == "Not Found"
+    assert search_server.requests == 2
+
+@pytest.mark.parametrize("search_server", [{"miss_rate": 0, "block_rate": 1}], indirect=True)
+def test_rate_limited_search_is_a_retryable_block(search_server):
+    resolver = app.HttpResolver(search_server.url)
+
+    with pytest.raises(urllib.error.HTTPError):
+        resolver.search_candidates("Jane Doe Acme site:linkedin.com/in")
+    with pytest.raises(app.SearchBlockedError) as raised:
+        lookup(resolver)
+    assert raised.value.retryable
+    assert "429" in str(raised.value)
+    with pytest.raises(app.SearchBlockedError):
+        asyncio.run(app.process_row_async({'Reviewer Name': "Jane Doe", 'Reviewer Company': "Acme"}, resolver,
+                                          raise_failures=True))
+
+def test_bot_check_page_is_blocked():
+    page = '<html><body><div class="anomaly-modal">Please confirm you are human</div></body></html>'
+
+    with pytest.raises(app.SearchBlockedError):
+        app.HttpResolver.parse_candidates(page)
@@ -0,0 +1,111 @@
+"""Lease queue semantics and distributed submissions (run with: python -m pytest tests)"""
+import time
+
+import pandas as pd
+import pytest
+
+import app
+from conftest import write_reviews
+
+ROWS = [("Maria Anders", "CTO, Northwind"), ("Anonymous", "Acme"), ("Hank Scorpio", "Globex"), ("Maria Anders", "Northwind")]
+
+@pytest.fixture
+def job_queue(tmp_path):
+    job_queue = app.SqliteLeaseQueue(tmp_path / "job_queue.sqlite3")
+    yield job_queue
+    job_queue.close()
+
+def resolve_all(job_queue, worker_id="w"):
+    while True:
+        tasks = job_queue.lease(worker_id, limit=100)
+        if not tasks:
+            return
+        for job_id, key, name, company in tasks:
+            job_queue.complete(job_id, key, f"https://www.linkedin.com/in/{name.lower().replace(' ', '-')}")
+
+def test_leases_are_exclusive_and_expire(job_queue):
+    job_queue.submit("job", "a.csv", [("k1", "A", "X", 1), ("k2", "B", "Y", 2)], total_rows=3)
+
+    first = job_queue.lease("w1", limit=1, lease_seconds=0.2)
+    second = job_queue.lease("w2", limit=5, lease_seconds=60)
+    assert [key for _, key, _, _ in first] == ["k1"]
+    assert [key for _, key, _, _ in second] == ["k2"]
+    assert job_queue.lease("w3") == []
+    assert job_queue.progress("job")["leased"] == 2
+
+    # w1 died: its lease runs out and the query is handed to someone else
+    time.sleep(0.3)
+    assert [key for _, key, _, _ in job_queue.lease("w3")] == ["k1"]
+    job_queue.complete("job", "k1", "Not Found")
+    job_queue.release("job", "k2")
+    assert [key for _, key, _, _ in job_queue.lease("w3")] == ["k2"]
+    job_queue.complete("job", "k2", "https://www.linkedin.com/in/b")
+
+    assert job_queue.progress("job") == {"total_rows": 3, "done_rows": 3, "pending": 0, "leased": 0, "done": 2}
+    assert job_queue.results("job") == {"k1": "Not Found", "k2": "https://www.linkedin.com/in/b"}
+
+def test_failures_back_off_then_settle_as_error(job_queue):
+    job_queue.submit("job", "a.csv", [("k1", "A", "X", 1)], total_rows=1)
+    job_queue.lease("w")
+    job_queue.fail("job", "k1", app.SearchTimeoutError("slow"), max_attempts=2)
+    assert job_queue.lease("w") == []  # Waiting out its retry backoff
+    assert job_queue.progress("job")["pending"] == 1
+
+    job_queue.fail("job", "k1", app.SearchTimeoutError("slow again"), max_attempts=2)
+    assert job_queue.results("job") == {"k1": "Error"}
+    assert job_queue.failures("job") == {"k1": ("timeout", 2, "slow again")}
+
+def test_remove_only_drops_its_own_job(job_queue):
+    job_queue.submit("a", "a.csv", [("k1", "A", "X", 1)], total_rows=1)
+    job_queue.submit("b", "b.csv", [("k1", "A", "X", 1)], total_rows=1)
+    job_queue.remove("a")
+
+    assert job_queue.progress("a")["total_rows"] == 0
+    assert [job_id for job_id, *_ in job_queue.lease("w")] == ["b"]
+
+def test_identical_uploads_keep_their_own_jobs(tmp_path, job_queue):
+    uploads = [write_reviews(tmp_path / name, ROWS) for name in ("first.csv", "second.csv")]
+    submitter = app.QueueSubmitter(job_queue, poll_seconds=0.01)
+    jobs = [submitter.add_file(app.FileJob(path.name, path, tmp_path / f"processed_{path.name}")) for path in uploads]
+    resolve_all(job_queue)
+
+    submitter.run()
+
+    for job in jobs:
+        assert job.failed_rows == 0
+        assert list(pd.read_csv(job.output_path)['LinkedIn Profile']) == [
+            "https://www.linkedin.com/in/maria-anders", "Anonymous",
+            "https://www.linkedin.com/in/hank-scorpio", "https://www.linkedin.com/in/maria-anders",
+        ]
+
+def test_resubmitted_content_reuses_finished_results(tmp_path, job_queue):
+    upload = write_reviews(tmp_path / "reviews.csv", ROWS)
+    first = app.QueueSubmitter(job_queue)
+    first.add_file(app.FileJob(upload.name, upload, tmp_path / "processed_1.csv"))
+    resolve_all(job_queue)
+
+    second = app.QueueSubmitter(job_queue, poll_seconds=0.01)
+    job = second.add_file(app.FileJob(upload.name, upload, tmp_path / "processed_2.csv"))
+    assert job_queue.lease("w") == []
+
+    second.run()
+    first.run()  # Still has everything it needs after the second one finished
+    assert pd.read_csv(job.output_path).equals(pd.read_csv(first.jobs[0].output_path))
+
+def test_identical_uploads_share_a_checkpoint_until_both_finish(tmp_path):
+    first = app.open_checkpoint("same", tmp_path)
+    second = app.open_checkpoint("same", tmp_path)
+    assert first is second
+    first.record("k1", "Not Found")
+
+    app.release_checkpoint(first)
+    assert second.lookup(["k1"]) == {"k1": "Not Found"}
+    app.release_checkpoint(second)
+    assert not second.exists()
+
+def test_unfinished_checkpoint_is_kept_for_a_resume(tmp_path):
+    checkpoint = app.open_checkpoint("interrupted", tmp_path)
+    checkpoint.record("k1", "Not Found")
+    app.release_checkpoint(checkpoint, finished=False)
+
+    assert app.Checkpoint("interrupted", tmp_path).lookup(["k1"]) == {"k1": "Not Found"}
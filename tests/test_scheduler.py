@@ -0,0 +1,185 @@
+"""LookupScheduler runs against a scripted resolver (run with: python -m pytest tests)"""
+import collections
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import app
+from conftest import write_reviews
+
+class ScriptedResolver(app.SearchResolver):
+    """Answers lookups from a script of outcomes per reviewer name, recording every call
+
+    An outcome is an exception to raise, a number of seconds to take before
+    finding the profile, or None for no LinkedIn result. Names without a
+    script (or whose script ran out) are found straight away.
+    """
+
+    name = "scripted"
+    host = "search.invalid"
+
+    def __init__(self, script, calls, started):
+        self.script = script
+        self.calls = calls
+        self.started = started
+
+    def search_candidates(self, query):
+        name = query.split(" site:")[0].rsplit(" ", 1)[0]
+        self.calls[name] += 1
+        self.started.set()
+        outcomes = self.script.get(name) or [0]
+        outcome = outcomes.pop(0) if len(outcomes) > 1 else outcomes[0]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        if outcome is None:
+            return app.normalize_candidates([{"href": "https://example.com/not-a-profile"}])
+        time.sleep(outcome)
+        return app.normalize_candidates([{"href": profile(name), "title": f"{name} | LinkedIn"}])
+
+def profile(name):
+    return f"https://www.linkedin.com/in/{name.lower().replace(' ', '-')}"
+
+@pytest.fixture
+def scripted(monkeypatch, lookup_cache, fast_buckets):
+    """Register the scripted backend; returns (script, calls, started) for a test to fill in and inspect"""
+    script, calls, started = {}, collections.Counter(), threading.Event()
+    monkeypatch.setitem(app.RESOLVER_BACKENDS, "scripted", lambda: ScriptedResolver(script, calls, started))
+    return script, calls, started
+
+@pytest.fixture
+def backoffs(monkeypatch):
+    """Attempt counts the scheduler asked to back off after, with the backoff itself cut short"""
+    attempts = []
+    monkeypatch.setattr(app, "retry_delay", lambda n: attempts.append(n) or 0.01)
+    return attempts
+
+ENGINES = [{"max_workers": 2}, {"engine": "async", "concurrency": 4}]
+
+def run_scheduler(tmp_path, files, **options):
+    scheduler = app.LookupScheduler(backend="scripted", delay_range=(0, 0), **options)
+    for name, rows in files.items():
+        path = write_reviews(tmp_path / name, rows)
+        scheduler.add_file(app.FileJob(name, path, tmp_path / f"processed_{name}"))
+    return scheduler.run()
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_retryable_failures_back_off_until_they_succeed(tmp_path, scripted, backoffs, engine):
+    script, calls, _ = scripted
+    script["Flaky Fred"] = [app.SearchTimeoutError("slow"), app.SearchBlockedError("captcha"), 0]
+
+    job, = run_scheduler(tmp_path, {"a.csv": [("Flaky Fred", "CEO, Acme")]}, max_attempts=3, **engine)
+
+    assert calls["Flaky Fred"] == 3
+    assert backoffs == [1, 2]
+    assert job.failed_rows == 0 and not job.failed_path.exists()
+    assert list(pd.read_csv(job.output_path)['LinkedIn Profile']) == [profile("Flaky Fred")]
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_attempts_are_capped_and_failed_rows_reported(tmp_path, scripted, backoffs, engine):
+    script, calls, _ = scripted
+    script["Down Dan"] = [app.SearchNetworkError("connection refused")]
+    script["Buggy Bob"] = [app.LookupFailure("layout changed")]
+    rows = [("Down Dan", "Acme"), ("Maria Anders", "Northwind"), ("Buggy Bob", "Globex"), ("Down Dan", "CTO, Acme")]
+
+    job, = run_scheduler(tmp_path, {"a.csv": rows}, max_attempts=3, **engine)
+
+    assert calls["Down Dan"] == 3
+    assert calls["Buggy Bob"] == 1  # Not retryable
+    assert backoffs == [1, 2]
+    assert list(pd.read_csv(job.output_path)['LinkedIn Profile']) == ["Error", profile("Maria Anders"), "Error", "Error"]
+
+    report = pd.read_csv(job.failed_path)
+    assert job.failed_rows == 3
+    assert list(report.columns) == ['Reviewer Name', 'Reviewer Company'] + app.FAILURE_COLUMNS
+    assert list(report['Failure Reason']) == ["network", "error", "network"]
+    assert list(report['Attempts']) == [3, 1, 3]
+    # The same report the queue submitter writes from the input and the failures
+    expected = tmp_path / "expected_failed.csv"
+    assert app.write_failed_rows(tmp_path / "a.csv", expected, job.failures) == 3
+    assert report.equals(pd.read_csv(expected))
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_queries_are_looked_up_once_across_files(tmp_path, scripted, engine):
+    script, calls, _ = scripted
+    script["Nobody Known"] = [None]
+    files = {
+        "a.csv": [("Maria Anders", "CTO, Northwind"), ("Nobody Known", "Initech"), ("Anonymous", "Acme")],
+        "b.csv": [("maria  anders", "Northwind"), ("Hank Scorpio", "Globex"), ("Nobody Known", "Initech")],
+    }
+
+    first, second = run_scheduler(tmp_path, files, chunk_rows=2, **engine)
+
+    assert calls == {"Maria Anders": 1, "Nobody Known": 1, "Hank Scorpio": 1}
+    assert list(pd.read_csv(first.output_path)['LinkedIn Profile']) == [profile("Maria Anders"), "Not Found", "Anonymous"]
+    assert list(pd.read_csv(second.output_path)['LinkedIn Profile']) == [
+        profile("Maria Anders"), profile("Hank Scorpio"), "Not Found",
+    ]
+    assert first.written_rows == first.done_rows == 3 and second.written_rows == second.done_rows == 3
+
+def test_async_engine_waits_for_adaptive_throttle_slots(tmp_path, scripted, fast_buckets, monkeypatch):
+    script, calls, _ = scripted
+    monkeypatch.setattr(app, "ADAPTIVE_SUCCESS_WINDOW", 1000)  # Hold concurrency at 2
+    fast_buckets[ScriptedResolver.host] = app.AdaptiveThrottle(rate=1000.0, concurrency=2, jitter=(0, 0))
+    rows = [(f"Slow {i}", "Acme") for i in range(8)]
+    script.update({name: [0.2] for name, _ in rows})
+
+    began = time.monotonic()
+    job, = run_scheduler(tmp_path, {"a.csv": rows}, engine="async", concurrency=8)
+    elapsed = time.monotonic() - began
+
+    # Four rounds of two lookups; each round starts as soon as slots are handed back, not on a polling tick
+    assert 0.75 < elapsed < 1.5
+    assert list(pd.read_csv(job.output_path)['LinkedIn Profile']) == [profile(name) for name, _ in rows]
+
+def test_idle_threads_leave_governor_slots_to_other_jobs(tmp_path, scripted, monkeypatch):
+    script, _, started = scripted
+    governor = app.WorkerGovernor(workers=2)
+    monkeypatch.setattr(app, "get_worker_governor", lambda backend=None: governor)
+    script["Slow Sam"] = [1.5]
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+
+    slow_job = threading.Thread(target=run_scheduler, args=(tmp_path / "a", {"a.csv": [("Slow Sam", "Acme")]}),
+                                kwargs={"max_workers": None})
+    slow_job.start()
+    started.wait(5)
+    began = time.monotonic()
+    run_scheduler(tmp_path / "b", {"b.csv": [(f"Quick {i}", "Acme") for i in range(20)]}, max_workers=None)
+    elapsed = time.monotonic() - began
+    slow_job.join()
+
+    # With the slow job's idle thread holding the second slot, this waited for the slow lookup to end
+    assert elapsed < 1.0
+
+@pytest.fixture
+def eager_hedges(monkeypatch):
+    monkeypatch.setattr(app, "HEDGE_MIN_SAMPLES", 3)
+    monkeypatch.setattr(app, "HEDGE_MIN_DELAY", 0.05)
+
+def test_slow_search_is_hedged_and_the_hedge_wins(tmp_path, scripted, eager_hedges):
+    script, calls, _ = scripted
+    script["Slow Sam"] = [2.0, 0]
+    rows = [(f"Quick {i}", "Acme") for i in range(6)] + [("Slow Sam", "Acme")]
+
+    began = time.monotonic()
+    job, = run_scheduler(tmp_path, {"a.csv": rows}, max_workers=4, hedge=True, hedge_budget=1.0)
+
+    assert time.monotonic() - began < 1.5
+    assert calls["Slow Sam"] == 2
+    assert pd.read_csv(job.output_path)['LinkedIn Profile'].iloc[-1] == profile("Slow Sam")
+
+def test_waiting_on_the_rate_limiter_is_not_hedged(tmp_path, scripted, fast_buckets, eager_hedges):
+    _, calls, _ = scripted
+    fast_buckets[ScriptedResolver.host] = app.TokenBucket(rate=5.0, burst=6, jitter=(0, 0))
+    rows = [(f"Quick {i}", "Acme") for i in range(12)]
+
+    scheduler = app.LookupScheduler(max_workers=6, backend="scripted", delay_range=(0, 0), hedge=True, hedge_budget=1.0)
+    scheduler.add_file(app.FileJob("a.csv", write_reviews(tmp_path / "a.csv", rows), tmp_path / "processed_a.csv"))
+    scheduler.run()
+
+    # Once the burst is spent lookups queue up to 1.2 s for tokens, far past the instant searches' p95,
+    # but none of that is the host being slow
+    assert scheduler.hedges == 0
+    assert sum(calls.values()) == 12